@@ -1,5 +1,6 @@
 """AgentScope-based agent implementation for Agent OS V2"""
 
+import asyncio
 import agentscope
 from agentscope.agents import DialogAgent
 from agentscope.message import Msg
@@ -96,9 +97,10 @@ Remember: You're part of a team helping users with Product Hunt launches and bus
             # Create AgentScope message
             from agentscope.message import Msg
             
-            # Generate response using AgentScope (this calls OpenAI)
+            # Generate response using AgentScope (this calls OpenAI synchronously,
+            # so run it in a worker thread to keep the event loop free)
             user_msg = Msg(name="user", content=message, role="user")
-            response_msg = self(user_msg)
+            response_msg = await asyncio.to_thread(self, user_msg)
             
             # Extract response content
             response_content = response_msg.content if hasattr(response_msg, 'content') else str(response_msg)
@@ -1,5 +1,6 @@
 """Simple OpenAI-based agent implementation for Agent OS V2"""
 
+import httpx
 import openai
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -12,6 +13,29 @@ from app.models.conversation import QuickOption, InteractionMode
 
 logger = get_logger(__name__)
 
+# One pooled client shared by every agent, so LLM calls reuse keep-alive connections
+_shared_client: Optional[openai.AsyncOpenAI] = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    """Get the shared OpenAI client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=30.0
+            )
+        )
+    return _shared_client
+
+async def close_openai_client():
+    """Close the shared OpenAI client if it was created"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
 class OpenAIAgent:
     """Simple OpenAI-based agent for Agent OS V2"""
     
@@ -32,8 +56,8 @@ class OpenAIAgent:
         self.expertise_areas = expertise_areas
         self.conversation_memory = []
         
-        # Initialize OpenAI client
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Shared OpenAI client
+        self.client = get_openai_client()
         
         # Build system prompt
         self.system_prompt = self._build_system_prompt()
@@ -179,7 +203,7 @@ Remember: You're part of a team helping users launch successful products. Be col
                     messages.append({"role": "assistant", "content": msg.get("content", "")})
             
             # Generate response using OpenAI
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",  # Using the stable, well-supported model
                 messages=messages,
                 max_tokens=500,
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any, List
 import uuid
-from datetime import datetime
 
 from app.models.api_keys import (
     SupportedService, APIKeyRequest, APIKeySubmission, 
-    AgentCapabilities, SERVICE_CONFIGS
+    APIKeyBatchSubmission, AgentCapabilities, SERVICE_CONFIGS
 )
 from app.services.api_key_manager import api_key_manager
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -33,7 +33,7 @@ async def request_api_key(
         return {
             "success": True,
             "request": request.dict(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -60,7 +60,7 @@ async def submit_api_key(submission: APIKeySubmission):
             "success": True,
             "message": f"API key for {submission.service.value} stored successfully",
             "agent_capabilities": agent_capabilities,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except HTTPException:
@@ -69,6 +69,36 @@ async def submit_api_key(submission: APIKeySubmission):
         logger.error(f"Error submitting API key: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error submitting API key: {str(e)}")
 
+@router.post("/submit-batch")
+async def submit_api_keys_batch(batch: APIKeyBatchSubmission):
+    """User submits several API keys in one request"""
+    
+    try:
+        success = await api_key_manager.submit_api_keys(batch)
+        
+        if not success:
+            raise HTTPException(status_code=400, detail="Invalid API key format or submission failed")
+        
+        # Agent capabilities are recomputed once for the whole batch
+        agent_capabilities = {}
+        for agent_name in ["Alex", "Dana", "Riley", "Jamie"]:
+            capabilities = await api_key_manager.get_agent_capabilities(agent_name, batch.session_id)
+            agent_capabilities[agent_name] = capabilities.dict()
+        
+        return {
+            "success": True,
+            "stored": {item.service.value: True for item in batch.keys},
+            "stored_count": len(batch.keys),
+            "agent_capabilities": agent_capabilities,
+            "timestamp": utc_now_iso()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting API keys: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error submitting API keys: {str(e)}")
+
 @router.get("/capabilities/{agent_name}")
 async def get_agent_capabilities(agent_name: str, session_id: str):
     """Get what an agent can do based on available API keys"""
@@ -79,7 +109,7 @@ async def get_agent_capabilities(agent_name: str, session_id: str):
         return {
             "success": True,
             "capabilities": capabilities.dict(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -96,7 +126,7 @@ async def get_session_status(session_id: str):
         return {
             "success": True,
             "session_status": status,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -121,7 +151,7 @@ async def get_supported_services():
         return {
             "success": True,
             "services": services,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -150,7 +180,7 @@ async def get_agent_service_mapping():
         return {
             "success": True,
             "agent_mapping": mapping,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -170,7 +200,7 @@ async def revoke_api_key(session_id: str, service: SupportedService):
         return {
             "success": True,
             "message": f"API key for {service.value} revoked successfully",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except HTTPException:
@@ -192,7 +222,7 @@ async def clear_session(session_id: str):
         return {
             "success": True,
             "message": "Session cleared successfully",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except HTTPException:
@@ -215,7 +245,7 @@ async def get_all_agent_capabilities(session_id: str):
         return {
             "success": True,
             "agent_capabilities": all_capabilities,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -234,7 +264,7 @@ async def validate_api_key_format(service: SupportedService, api_key: str):
             "valid": is_valid,
             "service": service.value,
             "message": "Valid format" if is_valid else "Invalid format",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -252,7 +282,7 @@ async def get_service_integrations():
             "success": True,
             "integrations": integrations,
             "count": len(integrations),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -270,7 +300,7 @@ async def sync_session_with_supabase(session_id: str):
             return {
                 "success": False,
                 "message": "Supabase not available or sync failed",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         
         # Get updated session status
@@ -280,7 +310,7 @@ async def sync_session_with_supabase(session_id: str):
             "success": True,
             "message": "Session synced successfully",
             "session_status": status,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -305,7 +335,7 @@ async def test_service_connection(service: SupportedService, session_id: str):
             "success": True,
             "service": service.value,
             "connection_status": test_result,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except HTTPException:
@@ -324,7 +354,7 @@ async def cleanup_expired_cache():
         return {
             "success": True,
             "message": "Cache cleanup completed",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -341,7 +371,7 @@ async def _test_service_connection(service: SupportedService, api_key: str) -> D
         "valid": True,
         "response_time_ms": 150,  # Mock response time
         "status": "connected",
-        "last_tested": datetime.utcnow().isoformat()
+        "last_tested": utc_now_iso()
     }
     
     # Service-specific validation logic would go here
@@ -5,12 +5,12 @@ Provides endpoints to trigger automation workflows
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from typing import Dict, Any, Optional, List
-from datetime import datetime
 from pydantic import BaseModel, Field
 
 from app.services.trigger_service import trigger_service
 from app.services.api_key_manager import api_key_manager
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -187,5 +187,5 @@ async def automation_health():
     return {
         "trigger_dev_available": trigger_service.is_available(),
         "project_ref": trigger_service.project_ref,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now_iso()
     } 
\ No newline at end of file
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 import json
 import uuid
 
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 from app.models.conversation import ConversationRequest, ConversationResponse, MessageType, QuickResponseRequest
 
 router = APIRouter()
@@ -25,6 +25,9 @@ class ChatMessage(BaseModel):
     conversation_id: Optional[str] = None
     context: Optional[Dict[str, Any]] = None
 
+class MessageBody(BaseModel):
+    message: str = Field(..., min_length=1, description="User message")
+
 class QuickResponse(BaseModel):
     option_id: str
     value: str
@@ -32,12 +35,10 @@ class QuickResponse(BaseModel):
     user_id: str
 
 @router.post("/start")
-async def start_conversation(message_data: Dict[str, Any]):
+async def start_conversation(message_data: MessageBody):
     """Start a new conversation"""
     
-    message = message_data.get("message", "")
-    if not message:
-        raise HTTPException(status_code=400, detail="Message is required")
+    message = message_data.message
     
     # Mock response for now
     return {
@@ -46,7 +47,7 @@ async def start_conversation(message_data: Dict[str, Any]):
             {
                 "agent_name": "Alex",
                 "content": f"Hi! I'm Alex, your strategic planning agent. I'd love to help you with: '{message}'. Let me understand what you're looking to accomplish.",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         ],
         "conversation_state": {
@@ -58,12 +59,10 @@ async def start_conversation(message_data: Dict[str, Any]):
     }
 
 @router.post("/continue/{conversation_id}")
-async def continue_conversation(conversation_id: str, message_data: Dict[str, Any]):
+async def continue_conversation(conversation_id: str, message_data: MessageBody):
     """Continue an existing conversation"""
     
-    message = message_data.get("message", "")
-    if not message:
-        raise HTTPException(status_code=400, detail="Message is required")
+    message = message_data.message
     
     # Mock response for now
     return {
@@ -72,7 +71,7 @@ async def continue_conversation(conversation_id: str, message_data: Dict[str, An
             {
                 "agent_name": "Alex",
                 "content": f"Thanks for that information: '{message}'. Let me help you move forward with this.",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         ],
         "conversation_state": {
@@ -90,7 +89,7 @@ async def get_conversation(conversation_id: str):
     return {
         "conversation_id": conversation_id,
         "status": "active",
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": utc_now_iso(),
         "message_count": 2,
         "lead_agent": "Alex"
     }
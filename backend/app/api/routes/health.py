@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException
-from datetime import datetime
 import asyncio
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -11,7 +11,7 @@ async def health_check():
     """Basic health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),
         "service": "Agent OS V2"
     }
 
@@ -20,7 +20,7 @@ async def detailed_health_check():
     """Detailed health check with system information"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),
         "service": "Agent OS V2",
         "version": "2.0.0",
         "components": {
@@ -39,7 +39,7 @@ async def agents_health_check():
         # For now, return basic status
         agents_status = {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "agents": {
                 "alex": {"status": "ready", "role": "Strategy Planning"},
                 "dana": {"status": "ready", "role": "Creative Content"},
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from app.services.integration_manager import integration_manager
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -55,7 +56,7 @@ async def get_integration_status(session_id: str):
         return {
             "success": True,
             "status": status,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
     except Exception as e:
         logger.error(f"Error getting integration status: {str(e)}")
@@ -83,7 +84,7 @@ async def test_all_connections(session_id: str):
         return {
             "success": True,
             "results": results,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
     except Exception as e:
         logger.error(f"Error testing connections: {str(e)}")
@@ -97,7 +98,7 @@ async def get_available_actions(session_id: str):
         return {
             "success": True,
             "actions": actions,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
     except Exception as e:
         logger.error(f"Error getting available actions: {str(e)}")
@@ -324,7 +325,7 @@ async def execute_integration_action(request: ExecuteActionRequest, session_id:
                 "success": True,
                 "result": result,
                 "action": f"{request.service}.{request.action}",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         else:
             raise HTTPException(status_code=400, detail=result.get("error", "Action execution failed"))
@@ -0,0 +1,20 @@
+import time
+
+# (epoch second, ISO string) for the most recent second formatted
+_last_iso = (0, "")
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string, truncated to the second
+    
+    The string is formatted at most once per second, so bulk callers stamping
+    many records in the same second share one formatting call.
+    """
+    global _last_iso
+    second = int(time.time())
+    cached = _last_iso
+    if cached[0] == second:
+        return cached[1]
+    
+    iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+    _last_iso = (second, iso)
+    return iso
@@ -17,7 +17,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = ""
     
     # CORS
-    ALLOWED_ORIGINS: List[str] = ["*"]
+    ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]  # Explicit list; no wildcard with credentials
+    CORS_MAX_AGE: int = 86400  # Seconds browsers may cache preflight responses
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -32,6 +33,10 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
     
+    # Redis (shared conversation state across replicas; in-memory when unset)
+    REDIS_URL: Optional[str] = None
+    CONVERSATION_TTL: int = 86400  # Seconds an idle conversation is kept in Redis
+    
     # Trigger.dev
     TRIGGER_DEV_API_URL: str = "https://api.trigger.dev"
     TRIGGER_DEV_API_KEY: Optional[str] = None
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
+import orjson
 
 try:
     from app.core.config import get_settings
@@ -63,18 +65,23 @@ app = FastAPI(
     description="A conversational AI system with personality-driven agents that engage in natural dialogue before coordinated action execution.",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
+    allow_origins=settings.ALLOWED_ORIGINS if settings else ["http://localhost:3000"],  # Set ALLOWED_ORIGINS in production
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],  # Preflight OPTIONS is handled by the middleware
+    allow_headers=["Authorization", "Content-Type"],  # The only request headers the frontend sends
+    max_age=settings.CORS_MAX_AGE if settings else 86400,
 )
 
+# Compress larger JSON bodies (multi-agent chat responses); level 1 keeps CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # Include routers (only if imports worked)
 if health:
     try:
@@ -99,6 +106,11 @@ if automation:
         print("✅ Automation router included")
     except Exception as e:
         print(f"❌ Error including automation router: {e}")
+    
+    @app.on_event("shutdown")
+    async def close_trigger_client():
+        """Close the Trigger.dev service's shared HTTP client"""
+        await automation.trigger_service.aclose()
 
 if api_keys:
     try:
@@ -118,25 +130,28 @@ if integrations:
 
 print(f"🎯 Final router status: health={bool(health)}, conversation={bool(conversation)}, automation={bool(automation)}, api_keys={bool(api_keys)}, integrations={bool(integrations)}")
 
+# The root payload never changes; serialize it once
+_ROOT_JSON = orjson.dumps({
+    "message": "Agent OS V2 - Conversational Multi-Agent System",
+    "version": "2.0.0",
+    "status": "running",
+    "agents": ["Alex (Strategy)", "Dana (Creative)", "Riley (Data)", "Jamie (Operations)"],
+    "docs": "/docs",
+    "features": [
+        "Natural conversation with AI agents",
+        "Proactive questioning and follow-ups",
+        "Trigger.dev automation integration",
+        "Real-time WebSocket communication",
+        "Product Hunt launch automation",
+        "Secure API key management",
+        "Agent-specific service integrations"
+    ]
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with system information"""
-    return {
-        "message": "Agent OS V2 - Conversational Multi-Agent System",
-        "version": "2.0.0",
-        "status": "running",
-        "agents": ["Alex (Strategy)", "Dana (Creative)", "Riley (Data)", "Jamie (Operations)"],
-        "docs": "/docs",
-        "features": [
-            "Natural conversation with AI agents",
-            "Proactive questioning and follow-ups",
-            "Trigger.dev automation integration",
-            "Real-time WebSocket communication",
-            "Product Hunt launch automation",
-            "Secure API key management",
-            "Agent-specific service integrations"
-        ]
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -151,6 +166,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=bool(settings and settings.DEBUG),
         log_level="info"
     ) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -40,6 +40,25 @@ class APIKeySubmission(BaseModel):
     session_id: str
     user_id: Optional[str] = None
 
+class APIKeyBatchItem(BaseModel):
+    """One key in a batch submission"""
+    service: SupportedService
+    api_key: str = Field(..., min_length=1)
+
+class APIKeyBatchSubmission(BaseModel):
+    """User submitting several API keys for one session in a single request"""
+    session_id: str
+    user_id: Optional[str] = None
+    keys: List[APIKeyBatchItem] = Field(..., min_length=1)
+    
+    @field_validator('keys')
+    @classmethod
+    def _unique_services(cls, keys: List[APIKeyBatchItem]) -> List[APIKeyBatchItem]:
+        services = [item.service for item in keys]
+        if len(set(services)) != len(services):
+            raise ValueError("Each service may appear only once in a batch")
+        return keys
+
 class UserAPIKeys(BaseModel):
     """User's API keys for session"""
     session_id: str
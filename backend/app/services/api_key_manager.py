@@ -1,14 +1,15 @@
 import hashlib
 import secrets
-from typing import Dict, List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import asyncio
 from cryptography.fernet import Fernet
 import base64
+import functools
 
 from app.models.api_keys import (
     SupportedService, APIKeyRequest, APIKeySubmission, 
-    UserAPIKeys, AgentCapabilities, SERVICE_CONFIGS, 
+    APIKeyBatchSubmission, UserAPIKeys, AgentCapabilities, SERVICE_CONFIGS, 
     AGENT_SERVICE_MAPPING
 )
 from app.core.logging import get_logger
@@ -16,6 +17,43 @@ from app.services.supabase_service import supabase_service
 
 logger = get_logger(__name__)
 
+@functools.lru_cache(maxsize=512)
+def _capability_summary(
+    agent_name: str,
+    available: FrozenSet[SupportedService]
+) -> Tuple[Tuple[str, ...], Tuple[SupportedService, ...], Tuple[APIKeyRequest, ...]]:
+    """Actions, missing services and setup suggestions for an agent given its available services
+    
+    Depends only on which services have keys, so results are memoized per key set.
+    """
+    
+    # Get services this agent can use
+    agent_services = AGENT_SERVICE_MAPPING.get(agent_name, [])
+    missing_services = tuple(service for service in agent_services if service not in available)
+    
+    # Build available actions
+    available_actions = []
+    for service in agent_services:
+        if service in available and service in SERVICE_CONFIGS:
+            config = SERVICE_CONFIGS[service]
+            available_actions.extend([f"✅ {cap}" for cap in config.capabilities])
+    
+    # Build setup suggestions for missing keys
+    setup_suggestions = []
+    for service in missing_services:
+        if service in SERVICE_CONFIGS:
+            config = SERVICE_CONFIGS[service]
+            suggestion = APIKeyRequest(
+                agent_name=agent_name,
+                service=service,
+                reason=f"Unlock {', '.join(config.capabilities[:2])} capabilities",
+                capabilities_unlocked=config.capabilities,
+                setup_instructions=config.instructions
+            )
+            setup_suggestions.append(suggestion)
+    
+    return tuple(available_actions), missing_services, tuple(setup_suggestions)
+
 class APIKeyManager:
     """Manages API keys securely with Supabase persistence and in-memory caching"""
     
@@ -127,6 +165,56 @@ class APIKeyManager:
             logger.error(f"Error storing API key: {str(e)}")
             return False
     
+    async def submit_api_keys(self, batch: APIKeyBatchSubmission) -> bool:
+        """User submits several API keys; either all of them are stored or none are"""
+        
+        try:
+            # Validate every key before writing any of them
+            invalid = [
+                item.service.value for item in batch.keys
+                if not self._validate_api_key_format(item.service, item.api_key)
+            ]
+            if invalid:
+                logger.warning(f"Invalid API key format for {', '.join(invalid)}")
+                return False
+            
+            user_id = self._get_user_id(batch.session_id)
+            
+            # Store in Supabase if available, in a single upsert
+            if supabase_service.is_available():
+                success = await supabase_service.store_api_keys(
+                    user_id=user_id,
+                    keys=[
+                        (
+                            item.service,
+                            SERVICE_CONFIGS[item.service].service.value.replace('_', ' ').title(),
+                            item.api_key
+                        )
+                        for item in batch.keys
+                    ]
+                )
+                
+                if not success:
+                    logger.error("Failed to store API keys in Supabase")
+                    return False
+            
+            # Update in-memory cache
+            if user_id not in self.key_cache:
+                self.key_cache[user_id] = {}
+            
+            for item in batch.keys:
+                self.key_cache[user_id][item.service] = self._encrypt_key(item.api_key)
+            self.cache_timestamps[user_id] = datetime.utcnow()
+            
+            logger.info(f"{len(batch.keys)} API keys stored", 
+                       session_id=batch.session_id, user_id=user_id)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error storing API keys: {str(e)}")
+            return False
+    
     def _validate_api_key_format(self, service: SupportedService, api_key: str) -> bool:
         """Basic API key format validation"""
         
@@ -188,41 +276,18 @@ class APIKeyManager:
         agent_services = AGENT_SERVICE_MAPPING.get(agent_name, [])
         
         # Check which keys are available
-        available_services = []
-        missing_services = []
-        
-        for service in agent_services:
-            if await self.get_api_key(session_id, service):
-                available_services.append(service)
-            else:
-                missing_services.append(service)
-        
-        # Build available actions
-        available_actions = []
-        for service in available_services:
-            if service in SERVICE_CONFIGS:
-                config = SERVICE_CONFIGS[service]
-                available_actions.extend([f"✅ {cap}" for cap in config.capabilities])
-        
-        # Build setup suggestions for missing keys
-        setup_suggestions = []
-        for service in missing_services:
-            if service in SERVICE_CONFIGS:
-                config = SERVICE_CONFIGS[service]
-                suggestion = APIKeyRequest(
-                    agent_name=agent_name,
-                    service=service,
-                    reason=f"Unlock {', '.join(config.capabilities[:2])} capabilities",
-                    capabilities_unlocked=config.capabilities,
-                    setup_instructions=config.instructions
-                )
-                setup_suggestions.append(suggestion)
+        available_services = frozenset([
+            service for service in agent_services
+            if await self.get_api_key(session_id, service)
+        ])
+        
+        available_actions, missing_services, setup_suggestions = _capability_summary(agent_name, available_services)
         
         return AgentCapabilities(
             agent_name=agent_name,
-            available_actions=available_actions,
-            missing_keys=missing_services,
-            setup_suggestions=setup_suggestions
+            available_actions=list(available_actions),
+            missing_keys=list(missing_services),
+            setup_suggestions=list(setup_suggestions)
         )
     
     async def get_session_status(self, session_id: str) -> Dict:
@@ -363,18 +428,16 @@ class APIKeyManager:
         try:
             user_id = self._get_user_id(session_id)
             
-            # Get fresh data from Supabase
-            user_keys = await supabase_service.get_user_keys(user_id)
+            # Get fresh keys from Supabase, decrypted in one batch
+            user_keys = await supabase_service.get_user_keys_decrypted(user_id)
             
-            # Update cache
+            # Update cache so get_api_key is served locally until the cache expires
             if user_keys:
                 self.key_cache[user_id] = {}
-                for service_name, key_info in user_keys.items():
+                for service_name, api_key in user_keys.items():
                     try:
                         service = SupportedService(service_name)
-                        # We don't cache the actual key, just mark it as available
-                        # The key will be fetched from Supabase when needed
-                        self.key_cache[user_id][service] = "available"
+                        self.key_cache[user_id][service] = self._encrypt_key(api_key)
                     except ValueError:
                         logger.warning(f"Unknown service in Supabase: {service_name}")
                 
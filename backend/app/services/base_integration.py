@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import httpx
+import json
+import orjson
 import asyncio
 from enum import Enum
 
@@ -11,6 +13,22 @@ from app.models.api_keys import SupportedService
 
 logger = get_logger(__name__)
 
+def _parse_json(raw: bytes) -> Any:
+    """Parse a response body with orjson, falling back to the lenient stdlib parser
+    
+    Raises ValueError when the body is not JSON at all.
+    """
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        pass
+    
+    # Error paths sometimes return non-strict JSON or an HTML page
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError("Response body is not valid JSON") from e
+
 class IntegrationStatus(str, Enum):
     """Integration status types"""
     CONNECTED = "connected"
@@ -29,10 +47,17 @@ class BaseIntegration(ABC):
         self.last_error: Optional[str] = None
         self.rate_limit_reset: Optional[datetime] = None
         
-        # HTTP client with common settings
+        # HTTP client with common settings; one pooled client per integration,
+        # HTTP/2 so concurrent and paginated calls share a connection
         self.client = httpx.AsyncClient(
             timeout=30.0,
-            headers={"User-Agent": "AgentOS/1.0"}
+            headers={"User-Agent": "AgentOS/1.0"},
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=64,
+                keepalive_expiry=75.0
+            )
         )
     
     @property
@@ -105,24 +130,32 @@ class BaseIntegration(ABC):
         method: str, 
         endpoint: str, 
         api_key: str,
-        data: Optional[Dict] = None,
+        data: Optional[Union[Dict, bytes]] = None,
         params: Optional[Dict] = None,
         headers: Optional[Dict] = None
     ) -> Dict[str, Any]:
-        """Make authenticated API request to the service"""
+        """Make authenticated API request to the service
+        
+        ``data`` may be a dict, or JSON bytes that were already encoded by the
+        caller and are sent as-is.
+        """
         
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
+        # Encode the JSON body once (integrations set Content-Type in their auth headers)
+        content = data if data is None or isinstance(data, bytes) else orjson.dumps(data)
+        
         # Prepare headers with authentication
         request_headers = await self._prepare_auth_headers(api_key)
         if headers:
-            request_headers.update(headers)
+            # Merge into a new dict; integrations may return shared header mappings
+            request_headers = {**request_headers, **headers}
         
         try:
             response = await self.client.request(
                 method=method,
                 url=url,
-                json=data,
+                content=content,
                 params=params,
                 headers=request_headers
             )
@@ -153,7 +186,7 @@ class BaseIntegration(ABC):
             if response.status_code >= 400:
                 error_msg = f"API request failed: {response.status_code}"
                 try:
-                    error_data = response.json()
+                    error_data = _parse_json(response.content)
                     error_msg = error_data.get("message", error_msg)
                 except:
                     pass
@@ -166,10 +199,20 @@ class BaseIntegration(ABC):
                 }
             
             # Success
+            try:
+                response_data = _parse_json(response.content) if response.content else {}
+            except ValueError:
+                return {
+                    "success": False,
+                    "error": "invalid_json",
+                    "status_code": response.status_code,
+                    "message": "API returned a non-JSON response"
+                }
+            
             self.status = IntegrationStatus.CONNECTED
             return {
                 "success": True,
-                "data": response.json() if response.content else {},
+                "data": response_data,
                 "status_code": response.status_code
             }
             
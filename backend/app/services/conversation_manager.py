@@ -1,12 +1,15 @@
 """Conversation Manager for Agent OS V2 using PraisonAI"""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import functools
 import uuid
 import asyncio
+import re
 
 from app.core.logging import get_logger
 from app.core.config import settings
+from app.services.conversation_store import conversation_store
 from app.models.conversation import (
     ConversationResponse, 
     AgentResponse, 
@@ -24,6 +27,57 @@ from app.agents.jamie_agentscope import Jamie
 
 logger = get_logger(__name__)
 
+def _any_of(*phrases: str) -> "re.Pattern[str]":
+    """Compile phrases into one case-insensitive alternation that finds any of them in a single scan"""
+    return re.compile("|".join(map(re.escape, phrases)), re.IGNORECASE)
+
+# Explicit "talk to <agent>" requests, checked in this order
+_EXPLICIT_AGENT_PATTERNS = (
+    ("Dana", _any_of('direct me to dana', 'talk to dana', 'connect me to dana', 'i want dana', '@dana')),
+    ("Riley", _any_of('direct me to riley', 'talk to riley', 'connect me to riley', 'i want riley', '@riley')),
+    ("Jamie", _any_of('direct me to jamie', 'talk to jamie', 'connect me to jamie', 'i want jamie', '@jamie')),
+    ("Alex", _any_of('direct me to alex', 'talk to alex', 'connect me to alex', 'i want alex', '@alex'))
+)
+_DIRECT_REQUEST_PATTERN = _any_of('direct me to', 'talk to', 'connect me to', 'i want', '@')
+
+# Topic keywords that pull an agent into the conversation
+_TOPIC_AGENT_PATTERNS = (
+    ("Alex", "Strategy", _any_of('strategy', 'plan', 'goal', 'timeline', 'launch')),
+    ("Dana", "Creative", _any_of('content', 'creative', 'brand', 'marketing', 'social')),
+    ("Riley", "Data", _any_of('data', 'metrics', 'analytics', 'track', 'measure')),
+    ("Jamie", "Automation", _any_of('automation', 'workflow', 'integrate', 'setup', 'technical'))
+)
+
+# Hand-off hints in an agent's reply
+_SUGGESTION_PATTERNS = (
+    ("Dana", _any_of('@dana', 'creative', 'content', 'brand')),
+    ("Riley", _any_of('@riley', 'data', 'metrics', 'track')),
+    ("Jamie", _any_of('@jamie', 'automation', 'setup', 'workflow')),
+    ("Alex", _any_of('@alex', 'strategy', 'plan'))
+)
+
+# Longer messages are matched without caching so the cache stays small
+_ROUTE_CACHE_MAX_MESSAGE_LENGTH = 512
+
+@functools.lru_cache(maxsize=1024)
+def _scan_message(message: str) -> Tuple[Optional[str], Tuple[Tuple[str, str], ...], bool]:
+    """Explicit agent request, (agent, topic) keyword matches and whether the user asked for someone directly"""
+    
+    explicit_agent = next(
+        (name for name, pattern in _EXPLICIT_AGENT_PATTERNS if pattern.search(message)),
+        None
+    )
+    topic_agents = tuple(
+        (name, topic) for name, topic, pattern in _TOPIC_AGENT_PATTERNS if pattern.search(message)
+    )
+    return explicit_agent, topic_agents, bool(_DIRECT_REQUEST_PATTERN.search(message))
+
+def _route_message(message: str) -> Tuple[Optional[str], Tuple[Tuple[str, str], ...], bool]:
+    """Keyword routing for a message; repeated short messages are answered from the cache"""
+    if len(message) > _ROUTE_CACHE_MAX_MESSAGE_LENGTH:
+        return _scan_message.__wrapped__(message)
+    return _scan_message(message)
+
 class ConversationManager:
     """Manages multi-agent conversations using AgentScope"""
     
@@ -68,6 +122,9 @@ class ConversationManager:
         try:
             logger.info(f"Processing message for conversation {conversation_id}")
             
+            # Pick up state another replica may have written
+            await self._load_conversation(conversation_id)
+            
             # Initialize conversation if new
             if conversation_id not in self.conversations:
                 self.conversations[conversation_id] = {
@@ -129,6 +186,9 @@ class ConversationManager:
             # Update conversation state
             conversation_state = self._update_conversation_state(conversation_id, agent_responses)
             
+            # Share the updated state with other replicas
+            await conversation_store.save(conversation_id, self.conversations[conversation_id])
+            
             # Create and return response
             response = ConversationResponse(
                 type=ConversationType.NEW_CONVERSATION if len(self.conversations[conversation_id]["messages"]) <= 2 else ConversationType.CONTINUED_CONVERSATION,
@@ -167,27 +227,31 @@ class ConversationManager:
                 timestamp=datetime.utcnow()
             )
     
+    async def _load_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Return the conversation record, preferring the shared store's copy"""
+        
+        # Another worker or replica may have advanced the conversation since we last saw it
+        if conversation_store.is_available():
+            conversation = await conversation_store.load(conversation_id)
+            if conversation is not None:
+                self.conversations[conversation_id] = conversation
+                return conversation
+        
+        return self.conversations.get(conversation_id)
+    
     def _determine_responding_agents(self, message: str, conversation_id: str) -> List[str]:
         """Determine which agents should respond to the message"""
         
-        message_lower = message.lower()
         responding_agents = []
         
         logger.info(f"🔍 Determining agents for message: '{message}' (conversation: {conversation_id})")
         
+        explicit_agent, topic_agents, direct_request = _route_message(message)
+        
         # Check for explicit agent requests first (highest priority)
-        if any(phrase in message_lower for phrase in ['direct me to dana', 'talk to dana', 'connect me to dana', 'i want dana', '@dana']):
-            responding_agents.append("Dana")
-            logger.info(f"✅ Explicit Dana request detected")
-        elif any(phrase in message_lower for phrase in ['direct me to riley', 'talk to riley', 'connect me to riley', 'i want riley', '@riley']):
-            responding_agents.append("Riley")
-            logger.info(f"✅ Explicit Riley request detected")
-        elif any(phrase in message_lower for phrase in ['direct me to jamie', 'talk to jamie', 'connect me to jamie', 'i want jamie', '@jamie']):
-            responding_agents.append("Jamie")
-            logger.info(f"✅ Explicit Jamie request detected")
-        elif any(phrase in message_lower for phrase in ['direct me to alex', 'talk to alex', 'connect me to alex', 'i want alex', '@alex']):
-            responding_agents.append("Alex")
-            logger.info(f"✅ Explicit Alex request detected")
+        if explicit_agent:
+            responding_agents.append(explicit_agent)
+            logger.info(f"✅ Explicit {explicit_agent} request detected")
         else:
             # Check if this is the first message in conversation
             conversation = self.conversations.get(conversation_id, {})
@@ -201,21 +265,9 @@ class ConversationManager:
                 logger.info(f"🎯 First message - Alex leads")
             else:
                 # Determine based on content keywords
-                if any(word in message_lower for word in ['strategy', 'plan', 'goal', 'timeline', 'launch']):
-                    responding_agents.append("Alex")
-                    logger.info(f"🎯 Strategy keywords detected - Alex selected")
-                
-                if any(word in message_lower for word in ['content', 'creative', 'brand', 'marketing', 'social']):
-                    responding_agents.append("Dana")
-                    logger.info(f"🎯 Creative keywords detected - Dana selected")
-                
-                if any(word in message_lower for word in ['data', 'metrics', 'analytics', 'track', 'measure']):
-                    responding_agents.append("Riley")
-                    logger.info(f"🎯 Data keywords detected - Riley selected")
-                
-                if any(word in message_lower for word in ['automation', 'workflow', 'integrate', 'setup', 'technical']):
-                    responding_agents.append("Jamie")
-                    logger.info(f"🎯 Automation keywords detected - Jamie selected")
+                for name, topic in topic_agents:
+                    responding_agents.append(name)
+                    logger.info(f"🎯 {topic} keywords detected - {name} selected")
         
         # Ensure at least one agent responds
         if not responding_agents:
@@ -225,7 +277,7 @@ class ConversationManager:
         logger.info(f"🎯 Final selected agents: {responding_agents}")
         
         # Limit to 2 agents max for better UX (unless explicit request)
-        if not any(phrase in message_lower for phrase in ['direct me to', 'talk to', 'connect me to', 'i want', '@']):
+        if not direct_request:
             return responding_agents[:2]
         else:
             return responding_agents[:1]  # Only the requested agent
@@ -247,22 +299,7 @@ class ConversationManager:
     def _suggest_next_agents(self, response_content: str) -> List[str]:
         """Suggest which agents might be helpful next based on response content"""
         
-        content_lower = response_content.lower()
-        suggestions = []
-        
-        if any(word in content_lower for word in ['@dana', 'creative', 'content', 'brand']):
-            suggestions.append("Dana")
-        
-        if any(word in content_lower for word in ['@riley', 'data', 'metrics', 'track']):
-            suggestions.append("Riley")
-        
-        if any(word in content_lower for word in ['@jamie', 'automation', 'setup', 'workflow']):
-            suggestions.append("Jamie")
-        
-        if any(word in content_lower for word in ['@alex', 'strategy', 'plan']):
-            suggestions.append("Alex")
-        
-        return suggestions
+        return [name for name, pattern in _SUGGESTION_PATTERNS if pattern.search(response_content)]
     
     def _update_conversation_state(self, conversation_id: str, agent_responses: List[AgentResponse]) -> ConversationState:
         """Update and return the conversation state"""
@@ -315,7 +352,7 @@ class ConversationManager:
     async def get_conversation_history(self, conversation_id: str, user_id: str) -> List[Dict[str, Any]]:
         """Get conversation history"""
         
-        conversation = self.conversations.get(conversation_id)
+        conversation = await self._load_conversation(conversation_id)
         if not conversation or conversation.get("user_id") != user_id:
             return []
         
@@ -324,7 +361,7 @@ class ConversationManager:
     async def get_conversation_status(self, conversation_id: str) -> Dict[str, Any]:
         """Get conversation status"""
         
-        conversation = self.conversations.get(conversation_id)
+        conversation = await self._load_conversation(conversation_id)
         if not conversation:
             return {"status": "not_found"}
         
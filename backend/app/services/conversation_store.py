@@ -0,0 +1,82 @@
+"""
+Conversation Store - Shared conversation state for multi-replica deployments
+Persists conversation records in Redis so any replica can continue a conversation
+"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime
+import orjson
+
+from app.core.logging import get_logger
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = get_logger(__name__)
+
+class ConversationStore:
+    """Redis-backed conversation records; a no-op when Redis is not configured"""
+    
+    def __init__(self):
+        self.ttl = settings.CONVERSATION_TTL
+        self._redis = None
+        
+        if settings.REDIS_URL and aioredis:
+            # Connections are opened lazily on first command
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+            logger.info("Conversation store initialized with Redis")
+        elif settings.REDIS_URL:
+            logger.warning("redis package not installed - using in-memory conversation storage")
+        else:
+            logger.warning("REDIS_URL not configured - using in-memory conversation storage")
+    
+    def is_available(self) -> bool:
+        """Check if Redis is configured"""
+        return self._redis is not None
+    
+    @staticmethod
+    def _key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}"
+    
+    async def load(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Load a conversation record, or None if it is not stored"""
+        if not self._redis:
+            return None
+        
+        try:
+            raw = await self._redis.get(self._key(conversation_id))
+            if raw is None:
+                return None
+            
+            record = orjson.loads(raw)
+            record["created_at"] = datetime.fromisoformat(record["created_at"])
+            return record
+        
+        except Exception as e:
+            logger.error(f"Failed to load conversation {conversation_id}: {str(e)}")
+            return None
+    
+    async def save(self, conversation_id: str, record: Dict[str, Any]) -> bool:
+        """Store a conversation record and refresh its expiry"""
+        if not self._redis:
+            return False
+        
+        try:
+            # orjson writes datetimes as ISO 8601 and str enums as their values
+            await self._redis.set(self._key(conversation_id), orjson.dumps(record, default=str), ex=self.ttl)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to save conversation {conversation_id}: {str(e)}")
+            return False
+    
+    async def aclose(self):
+        """Close the Redis connection pool"""
+        if self._redis:
+            await self._redis.aclose()
+
+# Global instance
+conversation_store = ConversationStore()
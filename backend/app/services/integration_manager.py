@@ -9,6 +9,7 @@ from app.services.integrations.google_calendar_integration import google_calenda
 from app.services.integrations.github_integration import github_integration
 from app.models.api_keys import SupportedService
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 logger = get_logger(__name__)
 
@@ -73,7 +74,7 @@ class IntegrationManager:
             "disconnected_count": 0,
             "error_count": 0,
             "integrations": connection_results,
-            "last_checked": datetime.utcnow().isoformat()
+            "last_checked": utc_now_iso()
         }
         
         # Count statuses
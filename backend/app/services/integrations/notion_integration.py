@@ -1,6 +1,9 @@
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 from datetime import datetime
+from functools import lru_cache
+import asyncio
 import json
+import orjson
 
 from app.services.base_integration import BaseIntegration, IntegrationStatus
 from app.models.api_keys import SupportedService
@@ -8,12 +11,18 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+@lru_cache(maxsize=256)
+def _encode_database_parent(database_id: str) -> bytes:
+    """JSON-encoded ``parent`` object for a database, reused across entries"""
+    return orjson.dumps({"database_id": database_id})
+
 class NotionIntegration(BaseIntegration):
     """Notion API integration for page creation, database management, and content automation"""
     
     def __init__(self):
         super().__init__(SupportedService.NOTION)
         self.api_version = "2022-06-28"
+        self.page_size = 100  # Notion's maximum page_size for search/query
     
     @property
     def base_url(self) -> str:
@@ -81,20 +90,16 @@ class NotionIntegration(BaseIntegration):
             return {"success": False, "error": "no_api_key"}
         
         try:
-            result = await self.make_api_request(
-                method="POST",
-                endpoint="search",
-                api_key=api_key,
-                data={
-                    "filter": {
-                        "value": "database",
-                        "property": "object"
-                    }
+            databases = []
+            async for result in self._paginated_search(api_key, {
+                "filter": {
+                    "value": "database",
+                    "property": "object"
                 }
-            )
-            
-            if result.get("success"):
-                databases = []
+            }):
+                if not result.get("success"):
+                    return result
+                
                 for db in result.get("data", {}).get("results", []):
                     databases.append({
                         "id": db.get("id"),
@@ -102,14 +107,12 @@ class NotionIntegration(BaseIntegration):
                         "url": db.get("url"),
                         "properties": list(db.get("properties", {}).keys())
                     })
-                
-                return {
-                    "success": True,
-                    "databases": databases,
-                    "count": len(databases)
-                }
-            else:
-                return result
+            
+            return {
+                "success": True,
+                "databases": databases,
+                "count": len(databases)
+            }
                 
         except Exception as e:
             logger.error(f"Error getting Notion databases: {str(e)}")
@@ -123,29 +126,24 @@ class NotionIntegration(BaseIntegration):
         
         try:
             if database_id:
-                # Get pages from specific database
-                result = await self.make_api_request(
-                    method="POST",
-                    endpoint=f"databases/{database_id}/query",
-                    api_key=api_key,
-                    data={}
-                )
+                # Query pages from specific database
+                endpoint = f"databases/{database_id}/query"
+                body = {}
             else:
                 # Search all pages
-                result = await self.make_api_request(
-                    method="POST",
-                    endpoint="search",
-                    api_key=api_key,
-                    data={
-                        "filter": {
-                            "value": "page",
-                            "property": "object"
-                        }
+                endpoint = "search"
+                body = {
+                    "filter": {
+                        "value": "page",
+                        "property": "object"
                     }
-                )
+                }
             
-            if result.get("success"):
-                pages = []
+            pages = []
+            async for result in self._paginated_search(api_key, body, endpoint=endpoint):
+                if not result.get("success"):
+                    return result
+                
                 for page in result.get("data", {}).get("results", []):
                     pages.append({
                         "id": page.get("id"),
@@ -154,14 +152,12 @@ class NotionIntegration(BaseIntegration):
                         "created_time": page.get("created_time"),
                         "last_edited_time": page.get("last_edited_time")
                     })
-                
-                return {
-                    "success": True,
-                    "pages": pages,
-                    "count": len(pages)
-                }
-            else:
-                return result
+            
+            return {
+                "success": True,
+                "pages": pages,
+                "count": len(pages)
+            }
                 
         except Exception as e:
             logger.error(f"Error getting Notion pages: {str(e)}")
@@ -306,10 +302,11 @@ class NotionIntegration(BaseIntegration):
             return {"success": False, "error": "no_api_key"}
         
         try:
-            data = {
-                "parent": {"database_id": database_id},
-                "properties": properties
-            }
+            # Splice the cached parent bytes in so only properties are encoded per call
+            data = (
+                b'{"parent":' + _encode_database_parent(database_id)
+                + b',"properties":' + orjson.dumps(properties) + b'}'
+            )
             
             result = await self.make_api_request(
                 method="POST",
@@ -400,6 +397,51 @@ class NotionIntegration(BaseIntegration):
     
     # Helper Methods
     
+    async def _paginated_search(
+        self, 
+        api_key: str, 
+        body: Dict[str, Any],
+        endpoint: str = "search"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every page of a paginated search/query result.
+        
+        The request for the next cursor is started before the current page is
+        handed to the caller, so Notion's round-trip overlaps with processing.
+        At most one request is in flight at a time. A failed request is yielded
+        as-is and ends the iteration.
+        """
+        body = {**body, "page_size": self.page_size}
+        next_task = asyncio.create_task(self.make_api_request(
+            method="POST",
+            endpoint=endpoint,
+            api_key=api_key,
+            data=body
+        ))
+        
+        try:
+            while next_task is not None:
+                result = await next_task
+                next_task = None
+                
+                if not result.get("success"):
+                    yield result
+                    return
+                
+                data = result.get("data", {})
+                next_cursor = data.get("next_cursor")
+                if data.get("has_more") and next_cursor:
+                    next_task = asyncio.create_task(self.make_api_request(
+                        method="POST",
+                        endpoint=endpoint,
+                        api_key=api_key,
+                        data={**body, "start_cursor": next_cursor}
+                    ))
+                
+                yield result
+        finally:
+            if next_task is not None:
+                next_task.cancel()
+    
     def _extract_title(self, title_array: List[Dict]) -> str:
         """Extract title text from Notion title array"""
         if not title_array:
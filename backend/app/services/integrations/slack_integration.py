@@ -1,18 +1,175 @@
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Mapping, Optional, Tuple, Union
+from types import MappingProxyType
+import asyncio
+import functools
 import json
+import operator
+import re
+import time
 
 from app.services.base_integration import BaseIntegration, IntegrationStatus
 from app.models.api_keys import SupportedService
+from app.core.clock import utc_now_iso
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Slack object IDs, e.g. C024BE91L (channel), G... (private), D... (DM), U.../W... (user)
+_CHANNEL_ID_RE = re.compile(r"^[CGD][A-Z0-9]{8,}$")
+_USER_ID_RE = re.compile(r"^[UW][A-Z0-9]{8,}$")
+
+# Message limits Slack enforces server-side; checked locally to skip doomed round trips
+_MAX_TEXT_LENGTH = 40000
+_MAX_BLOCKS = 50
+_MAX_BLOCK_TEXT_LENGTH = 3000
+
+# users.list members always carry id and name; pull both in one C-level call
+_USER_ID_NAME = operator.itemgetter("id", "name")
+_EMPTY: Dict[str, Any] = {}
+
+# Extractors for the fields get_channels/get_users can project with ``fields=[...]``
+_CHANNEL_FIELD_GETTERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "id": operator.itemgetter("id"),
+    "name": lambda c: c.get("name"),
+    "is_private": lambda c: c.get("is_private", False),
+    "is_member": lambda c: c.get("is_member", False),
+    "topic": lambda c: (c.get("topic") or _EMPTY).get("value", ""),
+    "purpose": lambda c: (c.get("purpose") or _EMPTY).get("value", ""),
+    "member_count": lambda c: c.get("num_members", 0),
+}
+_USER_FIELD_GETTERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "id": operator.itemgetter("id"),
+    "name": operator.itemgetter("name"),
+    "real_name": lambda u: u.get("real_name", ""),
+    "display_name": lambda u: (u.get("profile") or _EMPTY).get("display_name", ""),
+    "email": lambda u: (u.get("profile") or _EMPTY).get("email", ""),
+    "is_admin": lambda u: u.get("is_admin", False),
+    "is_owner": lambda u: u.get("is_owner", False),
+}
+
+# Available Slack workflows; built once at import and read-only
+_SLACK_WORKFLOWS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "team_notifications": MappingProxyType({
+        "description": "Send automated notifications to team channels",
+        "triggers": ("milestone_reached", "deadline_approaching", "error_occurred"),
+        "actions": ("send_message", "create_channel", "schedule_message")
+    }),
+    "project_updates": MappingProxyType({
+        "description": "Share project progress and updates with team",
+        "triggers": ("status_changed", "task_completed", "manual"),
+        "actions": ("send_message", "create_thread", "mention_users")
+    }),
+    "meeting_coordination": MappingProxyType({
+        "description": "Coordinate meetings and send reminders",
+        "triggers": ("meeting_scheduled", "reminder_time"),
+        "actions": ("send_message", "schedule_message", "create_channel")
+    }),
+    "alert_system": MappingProxyType({
+        "description": "Send alerts and urgent notifications",
+        "triggers": ("error_detected", "threshold_exceeded", "manual"),
+        "actions": ("send_message", "mention_channel", "escalate")
+    })
+})
+_WORKFLOW_KEYS = tuple(_SLACK_WORKFLOWS)
+
+@functools.lru_cache(maxsize=256)
+def _auth_headers(api_key: str) -> Mapping[str, str]:
+    """Slack request headers for a token, built once and shared by every request"""
+    # Bodies are sent as orjson-encoded UTF-8 bytes; Slack warns (missing_charset) without it
+    return MappingProxyType({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json; charset=utf-8"
+    })
+
+def _validate_message(text: str, blocks: Optional[List[Dict]]) -> Optional[Dict[str, Any]]:
+    """Return the error Slack would give for an oversized message, or None if it fits"""
+    if len(text) > _MAX_TEXT_LENGTH:
+        return {"success": False, "error": "msg_too_long"}
+    
+    if blocks:
+        if len(blocks) > _MAX_BLOCKS:
+            return {"success": False, "error": "too_many_blocks"}
+        
+        for block in blocks:
+            block_text = block.get("text")
+            if isinstance(block_text, dict) and len(block_text.get("text", "")) > _MAX_BLOCK_TEXT_LENGTH:
+                return {"success": False, "error": "invalid_blocks"}
+    
+    return None
+
+def _slack_operation(description: str):
+    """Log unexpected errors from a public Slack operation and return them as a failed result"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error %s: %s", description, e)
+                return {"success": False, "error": str(e)}
+        return wrapper
+    return decorator
+
+class _TokenBucket:
+    """Token-bucket limiter for one Slack workspace token, pausable via Retry-After"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.resume_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.resume_at:
+                    await asyncio.sleep(self.resume_at - now)
+                    continue
+                
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds: float):
+        """Hold every request on this token for ``seconds`` (from a 429 Retry-After)"""
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+        self.tokens = 0.0
+
 class SlackIntegration(BaseIntegration):
     """Slack API integration for messaging, channel management, and team communication automation"""
     
     def __init__(self):
         super().__init__(SupportedService.SLACK)
+        
+        # Channel/user listings are cached per session; concurrent callers share one fetch
+        self.list_cache_ttl = 300  # seconds
+        self.list_stale_ttl = 3600  # seconds past expiry a listing may still be served while it refreshes
+        self._list_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        self._list_inflight: Dict[Tuple, asyncio.Task] = {}
+        
+        # Name -> ID indexes per session: session_id -> (built_at, {name: id}[, complete])
+        self.index_refresh_interval = 60  # min seconds between refreshes on a miss
+        self._channel_name_index: Dict[str, Tuple[float, Dict[str, str], bool]] = {}
+        self._user_name_index: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        
+        # conversations.invite batching
+        self.invite_batch_size = 1000
+        self.invite_concurrency = 8
+        self.invite_max_attempts = 3
+        
+        # Rate limiting per workspace token (a bot token belongs to exactly one team)
+        self.rate_limit_per_second = 1.0
+        self.rate_limit_burst = 20
+        self.rate_limit_max_attempts = 5
+        self._limiters: Dict[str, _TokenBucket] = {}
     
     @property
     def base_url(self) -> str:
@@ -29,51 +186,143 @@ class SlackIntegration(BaseIntegration):
             "files:write"
         ]
     
-    async def _prepare_auth_headers(self, api_key: str) -> Dict[str, str]:
-        """Prepare Slack API headers"""
-        return {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+    async def _prepare_auth_headers(self, api_key: str) -> Mapping[str, str]:
+        """Prepare Slack API headers (shared per token, read-only)"""
+        return _auth_headers(api_key)
+    
+    async def make_api_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        api_key: str,
+        data: Optional[Union[Dict, bytes]] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Make a Slack API request through the workspace's rate limiter, retrying 429s"""
+        limiter = self._limiters.get(api_key)
+        if limiter is None:
+            limiter = self._limiters[api_key] = _TokenBucket(
+                self.rate_limit_per_second, self.rate_limit_burst
+            )
+        
+        for attempt in range(self.rate_limit_max_attempts):
+            await limiter.acquire()
+            result = await super().make_api_request(
+                method=method,
+                endpoint=endpoint,
+                api_key=api_key,
+                data=data,
+                params=params,
+                headers=headers
+            )
+            
+            if result.get("error") != "rate_limited":
+                return result
+            
+            # Retry-After is authoritative; back off exponentially on top of it for repeat 429s
+            delay = max(result.get("retry_after", 1), 2 ** attempt)
+            logger.warning("Slack %s rate limited, retrying in %ss (attempt %d)", endpoint, delay, attempt + 1)
+            limiter.pause(delay)
+        
+        return result
+    
+    async def _call(
+        self, 
+        api_key: str, 
+        method: str, 
+        endpoint: str, 
+        default_error: str,
+        data: Optional[Union[Dict, bytes]] = None,
+        params: Optional[Dict] = None
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Call a Slack Web API method and unwrap its ``ok`` envelope
+        
+        Returns ``(True, data)`` on success, otherwise ``(False, result)`` where
+        ``result`` is the failure to hand back to the caller as-is.
+        """
+        result = await self.make_api_request(
+            method=method,
+            endpoint=endpoint,
+            api_key=api_key,
+            data=data,
+            params=params
+        )
+        
+        if not result.get("success"):
+            return False, result
+        
+        response_data = result.get("data", {})
+        if not response_data.get("ok"):
+            return False, {"success": False, "error": response_data.get("error", default_error)}
+        
+        return True, response_data
+    
+    async def _iter_pages(
+        self, 
+        api_key: str, 
+        endpoint: str, 
+        params: Dict[str, Any], 
+        default_error: str,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        """Yield ``(ok, data)`` for each page of a cursor-paginated listing
+        
+        Stops after a failed page, after ``max_pages``, or when Slack returns an
+        empty cursor (pages may come back short, so that is the only end signal).
+        Consumers can stop iterating early without fetching the remaining pages.
+        """
+        params = dict(params)
+        pages = 0
+        
+        while True:
+            ok, data = await self._call(api_key, "GET", endpoint, default_error, params=params)
+            yield ok, data
+            if not ok:
+                return
+            
+            pages += 1
+            cursor = data.get("response_metadata", {}).get("next_cursor", "")
+            if not cursor or (max_pages is not None and pages >= max_pages):
+                return
+            params["cursor"] = cursor
+    
+    def _iter_conversations(
+        self, 
+        api_key: str, 
+        types: str, 
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        """Page through conversations.list (see _iter_pages)"""
+        return self._iter_pages(
+            api_key, "conversations.list", {"types": types, "limit": 1000}, "Failed to get channels", max_pages
+        )
     
     async def _test_api_connection(self, api_key: str) -> Dict[str, Any]:
         """Test Slack API connection by getting auth info"""
         try:
-            result = await self.make_api_request(
-                method="GET",
-                endpoint="auth.test",
-                api_key=api_key
-            )
-            
-            if result.get("success"):
-                auth_data = result.get("data", {})
-                if auth_data.get("ok"):
-                    return {
-                        "connected": True,
-                        "status": "success",
-                        "message": "Successfully connected to Slack",
-                        "workspace_info": {
-                            "team": auth_data.get("team", "Unknown"),
-                            "user": auth_data.get("user", "Unknown"),
-                            "user_id": auth_data.get("user_id", "Unknown"),
-                            "team_id": auth_data.get("team_id", "Unknown")
-                        }
-                    }
-                else:
-                    return {
-                        "connected": False,
-                        "status": "error",
-                        "message": auth_data.get("error", "Authentication failed")
-                    }
-            else:
+            ok, auth_data = await self._call(api_key, "GET", "auth.test", "Authentication failed")
+            if not ok:
                 return {
                     "connected": False,
                     "status": "error",
-                    "message": result.get("message", "Failed to connect to Slack")
+                    "message": auth_data.get("message") or auth_data.get("error", "Failed to connect to Slack")
                 }
+            
+            return {
+                "connected": True,
+                "status": "success",
+                "message": "Successfully connected to Slack",
+                "workspace_info": {
+                    "team": auth_data.get("team", "Unknown"),
+                    "user": auth_data.get("user", "Unknown"),
+                    "user_id": auth_data.get("user_id", "Unknown"),
+                    "team_id": auth_data.get("team_id", "Unknown")
+                }
+            }
                 
         except Exception as e:
-            logger.error(f"Slack connection test failed: {str(e)}")
+            logger.error("Slack connection test failed: %s", e)
             return {
                 "connected": False,
                 "status": "error", 
@@ -82,93 +331,136 @@ class SlackIntegration(BaseIntegration):
     
     # Core Slack Operations
     
-    async def get_channels(self, session_id: str, types: str = "public_channel,private_channel") -> Dict[str, Any]:
-        """Get all channels in the workspace"""
+    async def get_channels(
+        self, 
+        session_id: str, 
+        types: str = "public_channel,private_channel",
+        max_pages: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Get all channels in the workspace (cached per session, treat as read-only)
+        
+        Pass ``fields`` to build only those keys per channel (e.g. ["id", "name"]).
+        """
+        fields = tuple(fields) if fields else None
+        if fields and not set(fields) <= _CHANNEL_FIELD_GETTERS.keys():
+            return {"success": False, "error": "invalid_fields", "available_fields": list(_CHANNEL_FIELD_GETTERS)}
+        
+        return await self._cached_list(
+            ("channels", session_id, types, max_pages, fields),
+            lambda: self._fetch_channels(session_id, types, max_pages, fields)
+        )
+    
+    @_slack_operation("getting Slack channels")
+    async def _fetch_channels(
+        self, 
+        session_id: str, 
+        types: str,
+        max_pages: Optional[int],
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, Any]:
+        """Fetch all channels from Slack, following pagination cursors"""
         api_key = await self.get_api_key(session_id)
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            result = await self.make_api_request(
-                method="GET",
-                endpoint="conversations.list",
-                api_key=api_key,
-                params={"types": types, "limit": 100}
-            )
+        channels = []
+        
+        async for ok, data in self._iter_conversations(api_key, types, max_pages):
+            if not ok:
+                return data
             
-            if result.get("success"):
-                data = result.get("data", {})
-                if data.get("ok"):
-                    channels = []
-                    for channel in data.get("channels", []):
-                        channels.append({
-                            "id": channel.get("id"),
-                            "name": channel.get("name"),
-                            "is_private": channel.get("is_private", False),
-                            "is_member": channel.get("is_member", False),
-                            "topic": channel.get("topic", {}).get("value", ""),
-                            "purpose": channel.get("purpose", {}).get("value", ""),
-                            "member_count": channel.get("num_members", 0)
-                        })
-                    
-                    return {
-                        "success": True,
-                        "channels": channels,
-                        "count": len(channels)
-                    }
-                else:
-                    return {"success": False, "error": data.get("error", "Failed to get channels")}
+            if fields:
+                getters = [(field, _CHANNEL_FIELD_GETTERS[field]) for field in fields]
+                channels.extend(
+                    {field: getter(channel) for field, getter in getters}
+                    for channel in data.get("channels", [])
+                )
             else:
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error getting Slack channels: {str(e)}")
-            return {"success": False, "error": str(e)}
+                for channel in data.get("channels", []):
+                    channels.append({
+                        "id": channel["id"],
+                        "name": channel.get("name"),  # absent for IMs
+                        "is_private": channel.get("is_private", False),
+                        "is_member": channel.get("is_member", False),
+                        "topic": (channel.get("topic") or _EMPTY).get("value", ""),
+                        "purpose": (channel.get("purpose") or _EMPTY).get("value", ""),
+                        "member_count": channel.get("num_members", 0)
+                    })
+        
+        return {
+            "success": True,
+            "channels": channels,
+            "count": len(channels)
+        }
+    
+    async def get_users(
+        self, 
+        session_id: str, 
+        max_pages: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Get all users in the workspace (cached per session, treat as read-only)
+        
+        Pass ``fields`` to build only those keys per user (e.g. ["id", "name", "email"]).
+        """
+        fields = tuple(fields) if fields else None
+        if fields and not set(fields) <= _USER_FIELD_GETTERS.keys():
+            return {"success": False, "error": "invalid_fields", "available_fields": list(_USER_FIELD_GETTERS)}
+        
+        return await self._cached_list(
+            ("users", session_id, max_pages, fields),
+            lambda: self._fetch_users(session_id, max_pages, fields)
+        )
     
-    async def get_users(self, session_id: str) -> Dict[str, Any]:
-        """Get all users in the workspace"""
+    @_slack_operation("getting Slack users")
+    async def _fetch_users(
+        self, 
+        session_id: str, 
+        max_pages: Optional[int],
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, Any]:
+        """Fetch all users from Slack, following pagination cursors"""
         api_key = await self.get_api_key(session_id)
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            result = await self.make_api_request(
-                method="GET",
-                endpoint="users.list",
-                api_key=api_key,
-                params={"limit": 100}
-            )
+        users = []
+        getters = [(field, _USER_FIELD_GETTERS[field]) for field in fields] if fields else None
+        
+        # users.list pages are large; Slack recommends at most 200 per page
+        pages = self._iter_pages(api_key, "users.list", {"limit": 200}, "Failed to get users", max_pages)
+        async for ok, data in pages:
+            if not ok:
+                return data
             
-            if result.get("success"):
-                data = result.get("data", {})
-                if data.get("ok"):
-                    users = []
-                    for user in data.get("members", []):
-                        if not user.get("deleted", False) and not user.get("is_bot", False):
-                            users.append({
-                                "id": user.get("id"),
-                                "name": user.get("name"),
-                                "real_name": user.get("real_name", ""),
-                                "display_name": user.get("profile", {}).get("display_name", ""),
-                                "email": user.get("profile", {}).get("email", ""),
-                                "is_admin": user.get("is_admin", False),
-                                "is_owner": user.get("is_owner", False)
-                            })
-                    
-                    return {
-                        "success": True,
-                        "users": users,
-                        "count": len(users)
-                    }
-                else:
-                    return {"success": False, "error": data.get("error", "Failed to get users")}
-            else:
-                return result
+            for user in data.get("members", []):
+                if user.get("deleted") or user.get("is_bot"):
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Error getting Slack users: {str(e)}")
-            return {"success": False, "error": str(e)}
+                if getters:
+                    users.append({field: getter(user) for field, getter in getters})
+                    continue
+                
+                user_id, name = _USER_ID_NAME(user)
+                profile = user.get("profile") or _EMPTY
+                users.append({
+                    "id": user_id,
+                    "name": name,
+                    "real_name": user.get("real_name", ""),
+                    "display_name": profile.get("display_name", ""),
+                    "email": profile.get("email", ""),
+                    "is_admin": user.get("is_admin", False),
+                    "is_owner": user.get("is_owner", False)
+                })
+        
+        return {
+            "success": True,
+            "users": users,
+            "count": len(users)
+        }
     
+    @_slack_operation("sending Slack message")
     async def send_message(
         self, 
         session_id: str, 
@@ -177,50 +469,46 @@ class SlackIntegration(BaseIntegration):
         thread_ts: Optional[str] = None,
         blocks: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
-        """Send a message to a channel or user"""
+        """Send a message to a channel or user (channel may be an ID or a name)"""
+        invalid = _validate_message(text, blocks)
+        if invalid:
+            return invalid
+        
         api_key = await self.get_api_key(session_id)
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            data = {
-                "channel": channel,
+        channel = await self.resolve_channel_id(session_id, channel)
+        if not channel:
+            return {"success": False, "error": "channel_not_found"}
+        
+        data = {
+            "channel": channel,
+            "text": text
+        }
+        
+        if thread_ts:
+            data["thread_ts"] = thread_ts
+        
+        if blocks:
+            data["blocks"] = blocks
+        
+        ok, response_data = await self._call(
+            api_key, "POST", "chat.postMessage", "Failed to send message", data=data
+        )
+        if not ok:
+            return response_data
+        
+        return {
+            "success": True,
+            "message": {
+                "ts": response_data.get("ts"),
+                "channel": response_data.get("channel"),
                 "text": text
             }
-            
-            if thread_ts:
-                data["thread_ts"] = thread_ts
-            
-            if blocks:
-                data["blocks"] = blocks
-            
-            result = await self.make_api_request(
-                method="POST",
-                endpoint="chat.postMessage",
-                api_key=api_key,
-                data=data
-            )
-            
-            if result.get("success"):
-                response_data = result.get("data", {})
-                if response_data.get("ok"):
-                    return {
-                        "success": True,
-                        "message": {
-                            "ts": response_data.get("ts"),
-                            "channel": response_data.get("channel"),
-                            "text": text
-                        }
-                    }
-                else:
-                    return {"success": False, "error": response_data.get("error", "Failed to send message")}
-            else:
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error sending Slack message: {str(e)}")
-            return {"success": False, "error": str(e)}
+        }
     
+    @_slack_operation("creating Slack channel")
     async def create_channel(
         self, 
         session_id: str, 
@@ -234,100 +522,130 @@ class SlackIntegration(BaseIntegration):
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            data = {
-                "name": name,
-                "is_private": is_private
-            }
-            
-            result = await self.make_api_request(
-                method="POST",
-                endpoint="conversations.create",
-                api_key=api_key,
-                data=data
+        ok, response_data = await self._call(
+            api_key, "POST", "conversations.create", "Failed to create channel",
+            data={"name": name, "is_private": is_private}
+        )
+        if not ok:
+            return response_data
+        
+        channel_data = response_data.get("channel", {})
+        channel_id = channel_data.get("id")
+        self.invalidate_channels(session_id)
+        
+        # Set topic and purpose if provided (independent calls, issued together)
+        follow_ups = {}
+        if topic and channel_id:
+            follow_ups["conversations.setTopic"] = self._call(
+                api_key, "POST", "conversations.setTopic", "Failed to set topic",
+                data={"channel": channel_id, "topic": topic}
             )
-            
-            if result.get("success"):
-                response_data = result.get("data", {})
-                if response_data.get("ok"):
-                    channel_data = response_data.get("channel", {})
-                    channel_id = channel_data.get("id")
-                    
-                    # Set topic and purpose if provided
-                    if topic and channel_id:
-                        await self.make_api_request(
-                            method="POST",
-                            endpoint="conversations.setTopic",
-                            api_key=api_key,
-                            data={"channel": channel_id, "topic": topic}
-                        )
-                    
-                    if purpose and channel_id:
-                        await self.make_api_request(
-                            method="POST",
-                            endpoint="conversations.setPurpose",
-                            api_key=api_key,
-                            data={"channel": channel_id, "purpose": purpose}
-                        )
-                    
-                    return {
-                        "success": True,
-                        "channel": {
-                            "id": channel_id,
-                            "name": channel_data.get("name"),
-                            "is_private": channel_data.get("is_private", False),
-                            "created": channel_data.get("created")
-                        }
-                    }
-                else:
-                    return {"success": False, "error": response_data.get("error", "Failed to create channel")}
-            else:
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error creating Slack channel: {str(e)}")
-            return {"success": False, "error": str(e)}
+        
+        if purpose and channel_id:
+            follow_ups["conversations.setPurpose"] = self._call(
+                api_key, "POST", "conversations.setPurpose", "Failed to set purpose",
+                data={"channel": channel_id, "purpose": purpose}
+            )
+        
+        if follow_ups:
+            results = await asyncio.gather(*follow_ups.values(), return_exceptions=True)
+            for endpoint, follow_up in zip(follow_ups, results):
+                # The channel exists at this point, so failures here are only logged
+                if isinstance(follow_up, Exception):
+                    logger.warning("Slack %s failed for %s: %s", endpoint, channel_id, follow_up)
+                elif not follow_up[0]:
+                    logger.warning("Slack %s failed for %s: %s", endpoint, channel_id, follow_up[1].get("error"))
+        
+        return {
+            "success": True,
+            "channel": {
+                "id": channel_id,
+                "name": channel_data.get("name"),
+                "is_private": channel_data.get("is_private", False),
+                "created": channel_data.get("created")
+            }
+        }
     
+    @_slack_operation("inviting users to Slack channel")
     async def invite_to_channel(
         self, 
         session_id: str, 
         channel: str, 
         users: List[str]
     ) -> Dict[str, Any]:
-        """Invite users to a channel"""
+        """Invite users to a channel (channel and users may be IDs, names or emails)"""
         api_key = await self.get_api_key(session_id)
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            data = {
-                "channel": channel,
-                "users": ",".join(users)
+        channel = await self.resolve_channel_id(session_id, channel)
+        if not channel:
+            return {"success": False, "error": "channel_not_found"}
+        
+        user_ids = []
+        for user in users:
+            user_id = await self.resolve_user_id(session_id, user)
+            if not user_id:
+                return {"success": False, "error": "user_not_found", "user": user}
+            user_ids.append(user_id)
+        
+        # conversations.invite takes at most 1000 users per call
+        chunks = [
+            user_ids[i:i + self.invite_batch_size]
+            for i in range(0, len(user_ids), self.invite_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.invite_concurrency)
+        
+        async def invite_chunk(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._invite_chunk(api_key, channel, chunk)
+        
+        results = await asyncio.gather(*(invite_chunk(chunk) for chunk in chunks))
+        
+        invited = 0
+        failed_users = []
+        errors = []
+        for chunk, chunk_result in zip(chunks, results):
+            if chunk_result.get("success"):
+                invited += len(chunk)
+            else:
+                failed_users.extend(chunk)
+                errors.append(chunk_result.get("error", "Failed to invite users"))
+        
+        if errors:
+            return {
+                "success": False,
+                "error": errors[0],
+                "invited": invited,
+                "failed_users": failed_users
             }
-            
-            result = await self.make_api_request(
-                method="POST",
-                endpoint="conversations.invite",
-                api_key=api_key,
-                data=data
+        
+        return {
+            "success": True,
+            "invited": invited,
+            "message": f"Successfully invited {invited} users to channel"
+        }
+    
+    async def _invite_chunk(self, api_key: str, channel: str, users: List[str]) -> Dict[str, Any]:
+        """Invite one batch of users, retrying transient failures with exponential backoff"""
+        for attempt in range(self.invite_max_attempts):
+            ok, result = await self._call(
+                api_key, "POST", "conversations.invite", "Failed to invite users",
+                data={"channel": channel, "users": ",".join(users)}
             )
+            if ok:
+                return {"success": True}
             
-            if result.get("success"):
-                response_data = result.get("data", {})
-                if response_data.get("ok"):
-                    return {
-                        "success": True,
-                        "message": f"Successfully invited {len(users)} users to channel"
-                    }
-                else:
-                    return {"success": False, "error": response_data.get("error", "Failed to invite users")}
-            else:
+            # Rate limits are already retried in make_api_request
+            if result.get("error") not in ("timeout", "request_error"):
                 return result
-                
-        except Exception as e:
-            logger.error(f"Error inviting users to Slack channel: {str(e)}")
-            return {"success": False, "error": str(e)}
+            
+            if attempt + 1 < self.invite_max_attempts:
+                await asyncio.sleep(2 ** attempt)
+        
+        return result
     
+    @_slack_operation("scheduling Slack message")
     async def schedule_message(
         self, 
         session_id: str, 
@@ -336,47 +654,42 @@ class SlackIntegration(BaseIntegration):
         post_at: int,  # Unix timestamp
         blocks: Optional[List[Dict]] = None
     ) -> Dict[str, Any]:
-        """Schedule a message to be sent later"""
+        """Schedule a message to be sent later (channel may be an ID or a name)"""
+        invalid = _validate_message(text, blocks)
+        if invalid:
+            return invalid
+        
         api_key = await self.get_api_key(session_id)
         if not api_key:
             return {"success": False, "error": "no_api_key"}
         
-        try:
-            data = {
+        channel = await self.resolve_channel_id(session_id, channel)
+        if not channel:
+            return {"success": False, "error": "channel_not_found"}
+        
+        data = {
+            "channel": channel,
+            "text": text,
+            "post_at": post_at
+        }
+        
+        if blocks:
+            data["blocks"] = blocks
+        
+        ok, response_data = await self._call(
+            api_key, "POST", "chat.scheduleMessage", "Failed to schedule message", data=data
+        )
+        if not ok:
+            return response_data
+        
+        return {
+            "success": True,
+            "scheduled_message": {
+                "id": response_data.get("scheduled_message_id"),
                 "channel": channel,
-                "text": text,
                 "post_at": post_at
             }
-            
-            if blocks:
-                data["blocks"] = blocks
-            
-            result = await self.make_api_request(
-                method="POST",
-                endpoint="chat.scheduleMessage",
-                api_key=api_key,
-                data=data
-            )
-            
-            if result.get("success"):
-                response_data = result.get("data", {})
-                if response_data.get("ok"):
-                    return {
-                        "success": True,
-                        "scheduled_message": {
-                            "id": response_data.get("scheduled_message_id"),
-                            "channel": channel,
-                            "post_at": post_at
-                        }
-                    }
-                else:
-                    return {"success": False, "error": response_data.get("error", "Failed to schedule message")}
-            else:
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error scheduling Slack message: {str(e)}")
-            return {"success": False, "error": str(e)}
+        }
     
     # Trigger.dev Workflow Integration
     
@@ -390,37 +703,14 @@ class SlackIntegration(BaseIntegration):
         workflow_name = workflow_payload.get("name")
         config = workflow_payload.get("config", {})
         
-        # Define available Slack workflows
-        slack_workflows = {
-            "team_notifications": {
-                "description": "Send automated notifications to team channels",
-                "triggers": ["milestone_reached", "deadline_approaching", "error_occurred"],
-                "actions": ["send_message", "create_channel", "schedule_message"]
-            },
-            "project_updates": {
-                "description": "Share project progress and updates with team",
-                "triggers": ["status_changed", "task_completed", "manual"],
-                "actions": ["send_message", "create_thread", "mention_users"]
-            },
-            "meeting_coordination": {
-                "description": "Coordinate meetings and send reminders",
-                "triggers": ["meeting_scheduled", "reminder_time"],
-                "actions": ["send_message", "schedule_message", "create_channel"]
-            },
-            "alert_system": {
-                "description": "Send alerts and urgent notifications",
-                "triggers": ["error_detected", "threshold_exceeded", "manual"],
-                "actions": ["send_message", "mention_channel", "escalate"]
-            }
-        }
-        
         workflow_type = config.get("workflow_type", "team_notifications")
         
-        if workflow_type not in slack_workflows:
+        workflow_definition = _SLACK_WORKFLOWS.get(workflow_type)
+        if workflow_definition is None:
             return {
                 "success": False,
                 "error": "invalid_workflow_type",
-                "available_workflows": list(slack_workflows.keys())
+                "available_workflows": _WORKFLOW_KEYS
             }
         
         # Create workflow configuration
@@ -428,9 +718,9 @@ class SlackIntegration(BaseIntegration):
             "name": workflow_name,
             "service": "slack",
             "type": workflow_type,
-            "config": slack_workflows[workflow_type],
+            "config": dict(workflow_definition),
             "user_config": config,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": utc_now_iso()
         }
         
         # In a real implementation, this would call Trigger.dev API
@@ -442,6 +732,127 @@ class SlackIntegration(BaseIntegration):
     
     # Helper Methods
     
+    async def _cached_list(
+        self, 
+        key: Tuple, 
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return a cached listing, or join/start the single in-flight fetch for it
+        
+        Expired listings are served stale for up to ``list_stale_ttl`` while a
+        background fetch revalidates them, so only a cold cache waits on Slack.
+        """
+        now = time.monotonic()
+        entry = self._list_cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            
+            if now - entry[0] < self.list_stale_ttl:
+                if key not in self._list_inflight:
+                    self._list_inflight[key] = asyncio.create_task(self._fill_list_cache(key, fetch))
+                return entry[1]
+        
+        task = self._list_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill_list_cache(key, fetch))
+            self._list_inflight[key] = task
+        
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+    
+    async def _fill_list_cache(
+        self, 
+        key: Tuple, 
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Run a listing fetch and cache it if it succeeded"""
+        try:
+            result = await fetch()
+            if result.get("success"):
+                self._list_cache[key] = (time.monotonic() + self.list_cache_ttl, result)
+            return result
+        finally:
+            self._list_inflight.pop(key, None)
+    
+    def invalidate_channels(self, session_id: str):
+        """Drop cached channel listings for a session"""
+        for key in [k for k in self._list_cache if k[0] == "channels" and k[1] == session_id]:
+            del self._list_cache[key]
+        self._channel_name_index.pop(session_id, None)
+    
+    def invalidate_users(self, session_id: str):
+        """Drop cached user listings for a session"""
+        for key in [k for k in self._list_cache if k[0] == "users" and k[1] == session_id]:
+            del self._list_cache[key]
+        self._user_name_index.pop(session_id, None)
+    
+    async def resolve_channel_id(self, session_id: str, channel: str) -> Optional[str]:
+        """Resolve a channel name (with or without '#') to its ID; channel and user IDs pass through"""
+        # chat.postMessage accepts a user ID as the channel to open a DM
+        if _CHANNEL_ID_RE.match(channel) or _USER_ID_RE.match(channel):
+            return channel
+        
+        name = channel.lstrip("#")
+        entry = self._channel_name_index.get(session_id)
+        if entry is not None and (
+            name in entry[1] or (entry[2] and time.monotonic() - entry[0] < self.index_refresh_interval)
+        ):
+            return entry[1].get(name)
+        
+        # A miss on a full but old index may mean a new channel: drop cached listings
+        if entry is not None and entry[2]:
+            self.invalidate_channels(session_id)
+        
+        api_key = await self.get_api_key(session_id)
+        if not api_key:
+            return None
+        
+        # Page through conversations, indexing as we go, and stop at the page
+        # that contains the name; the index is only complete if we reach the end
+        index = {}
+        async for ok, data in self._iter_conversations(api_key, "public_channel,private_channel"):
+            if not ok:
+                return None
+            
+            for c in data.get("channels", []):
+                if c.get("name"):
+                    index[c["name"]] = c["id"]
+            
+            if name in index:
+                self._channel_name_index[session_id] = (time.monotonic(), index, False)
+                return index[name]
+        
+        self._channel_name_index[session_id] = (time.monotonic(), index, True)
+        return None
+    
+    async def resolve_user_id(self, session_id: str, user: str) -> Optional[str]:
+        """Resolve a username (with or without '@') or email to a user ID; IDs pass through"""
+        if _USER_ID_RE.match(user):
+            return user
+        
+        name = user.lstrip("@").lower()
+        entry = self._user_name_index.get(session_id)
+        if entry is not None and (
+            name in entry[1] or time.monotonic() - entry[0] < self.index_refresh_interval
+        ):
+            return entry[1].get(name)
+        
+        if entry is not None:
+            self.invalidate_users(session_id)
+        
+        result = await self.get_users(session_id, fields=["id", "name", "email"])
+        if not result.get("success"):
+            return None
+        
+        index = {}
+        for u in result["users"]:
+            if u.get("email"):
+                index[u["email"].lower()] = u["id"]
+            index[u["name"].lower()] = u["id"]
+        self._user_name_index[session_id] = (time.monotonic(), index)
+        return index.get(name)
+    
     def create_rich_message_blocks(
         self, 
         title: str, 
@@ -451,6 +862,7 @@ class SlackIntegration(BaseIntegration):
     ) -> List[Dict[str, Any]]:
         """Create rich message blocks for better formatting"""
         
+        # Fresh dicts on every call: callers are free to mutate the returned blocks
         blocks = [
             {
                 "type": "section",
@@ -478,17 +890,18 @@ class SlackIntegration(BaseIntegration):
     def create_action_blocks(self, actions: List[Dict[str, str]]) -> Dict[str, Any]:
         """Create action buttons for interactive messages"""
         
-        elements = []
-        for action in actions:
-            elements.append({
+        elements = [
+            {
                 "type": "button",
                 "text": {
                     "type": "plain_text",
                     "text": action.get("text", "Action")
                 },
                 "value": action.get("value", ""),
-                "action_id": action.get("action_id", f"action_{len(elements)}")
-            })
+                "action_id": action.get("action_id") or f"action_{index}"
+            }
+            for index, action in enumerate(actions)
+        ]
         
         return {
             "type": "actions",
@@ -1,11 +1,16 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
 import os
+import threading
 import secrets
 import hashlib
+import time
 from supabase import create_client, Client
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import hashes
 import base64
 
@@ -15,12 +20,51 @@ from app.models.api_keys import SupportedService
 
 logger = get_logger(__name__)
 
+# Key derivation functions recorded in encrypted_api_keys.kdf. The master key is
+# random, so new rows use HKDF; PBKDF2 rows are still readable and are replaced
+# on their next write.
+KDF_HKDF = 'HKDF-SHA256'
+KDF_PBKDF2 = 'PBKDF2-SHA256'
+
+# Ciphers recorded in encrypted_api_keys.algorithm. New rows bind salt+iv into the
+# GCM tag as associated data; older rows carry a separate SHA256 integrity_hash.
+ALGORITHM_AES_GCM_AAD = 'AES-256-GCM-AAD'
+ALGORITHM_AES_GCM = 'AES-256-GCM'
+
+# Layout of the packed ``blob`` column: salt(32) + iv(12) + auth_tag(16) + ciphertext
+_BLOB_SALT = slice(0, 32)
+_BLOB_IV = slice(32, 44)
+_BLOB_TAG = slice(44, 60)
+_BLOB_CIPHERTEXT = slice(60, None)
+
+# Columns read from encrypted_api_keys, instead of select('*')
+_DECRYPT_COLUMNS = 'id,expires_at,blob,encrypted_key,salt,iv,auth_tag,integrity_hash,algorithm,kdf'
+_KEY_METADATA_COLUMNS = 'id,service,service_name,created_at,expires_at,last_used_at,usage_count,status'
+
 class SupabaseService:
     """Handles Supabase database operations for API key storage using existing schema"""
     
     def __init__(self):
         self.client: Optional[Client] = None
         self.master_key: Optional[bytes] = None
+        self._available = False
+        
+        # Ciphers for derived encryption keys, LRU by (user_id, salt, kdf); repeat reads
+        # skip both the KDF and the AES key schedule
+        self.derived_key_cache_size = 4096
+        self._derived_keys: "OrderedDict[Tuple[str, bytes, str], AESGCM]" = OrderedDict()
+        self._derived_keys_lock = threading.Lock()
+        
+        # Worker threads for bulk decryption; the KDFs release the GIL
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        
+        # Active key row ids by (user_id, service), so usage logging skips the lookup
+        self.key_id_cache_ttl = 300  # seconds
+        self._key_ids: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        
+        # Fire-and-forget usage updates, referenced until they finish
+        self._background_tasks: Set[asyncio.Task] = set()
+        
         self._initialize()
     
     def _initialize(self):
@@ -48,49 +92,72 @@ class SupabaseService:
         except Exception as e:
             logger.error(f"Failed to initialize Supabase service: {str(e)}")
             self.client = None
+        
+        # Fixed after initialization; checked on every public call
+        self._available = self.client is not None and self.master_key is not None
     
     def is_available(self) -> bool:
         """Check if Supabase is available"""
-        return self.client is not None and self.master_key is not None
+        return self._available
+    
+    def _get_cipher(self, user_id: str, salt: bytes, kdf_name: str = KDF_HKDF) -> AESGCM:
+        """AES-GCM cipher for the key derived from master key, user ID and salt"""
+        cache_key = (user_id, salt, kdf_name)
+        with self._derived_keys_lock:
+            aesgcm = self._derived_keys.get(cache_key)
+            if aesgcm is not None:
+                self._derived_keys.move_to_end(cache_key)
+                return aesgcm
+        
+        if kdf_name == KDF_HKDF:
+            key = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                info=user_id.encode(),
+            ).derive(self.master_key)
+        else:
+            # OpenSSL-backed PBKDF2-HMAC-SHA256, same parameters as the rows were written with
+            key = hashlib.pbkdf2_hmac('sha256', self.master_key + user_id.encode(), salt, 100000, 32)
+        
+        aesgcm = AESGCM(key)
+        with self._derived_keys_lock:
+            self._derived_keys[cache_key] = aesgcm
+            if len(self._derived_keys) > self.derived_key_cache_size:
+                self._derived_keys.popitem(last=False)
+        return aesgcm
     
-    def _derive_key(self, user_id: str, salt: bytes) -> bytes:
-        """Derive encryption key from master key and user ID"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        return kdf.derive(self.master_key + user_id.encode())
+    def _forget_derived_keys(self, user_id: str):
+        """Drop cached derived keys for a user"""
+        with self._derived_keys_lock:
+            for cache_key in [k for k in self._derived_keys if k[0] == user_id]:
+                del self._derived_keys[cache_key]
+    
+    def _forget_key_ids(self, user_id: str, service: Optional[str] = None):
+        """Drop cached key row ids for a user (or one of their services)"""
+        for cache_key in [k for k in self._key_ids if k[0] == user_id and service in (None, k[1])]:
+            del self._key_ids[cache_key]
     
     def _encrypt_api_key(self, api_key: str, user_id: str) -> Dict[str, str]:
         """Encrypt API key using AES-256-GCM"""
         try:
-            # Generate salt and IV
-            salt = secrets.token_bytes(32)
-            iv = secrets.token_bytes(12)  # 96-bit IV for GCM
+            # Generate salt and 96-bit GCM IV from a single random draw
+            random_bytes = secrets.token_bytes(44)
+            salt, iv = random_bytes[:32], random_bytes[32:]
             
             # Derive key
-            key = self._derive_key(user_id, salt)
-            
-            # Encrypt
-            aesgcm = AESGCM(key)
-            ciphertext = aesgcm.encrypt(iv, api_key.encode(), None)
+            aesgcm = self._get_cipher(user_id, salt, KDF_HKDF)
             
-            # Split ciphertext and auth tag (last 16 bytes)
-            encrypted_data = ciphertext[:-16]
-            auth_tag = ciphertext[-16:]
+            # Encrypt, authenticating salt and IV alongside the ciphertext
+            ciphertext = aesgcm.encrypt(iv, api_key.encode(), salt + iv)
             
-            # Create integrity hash
-            integrity_data = salt + iv + encrypted_data + auth_tag
-            integrity_hash = hashlib.sha256(integrity_data).hexdigest()
+            # Pack salt, IV, auth tag (last 16 bytes) and ciphertext into one field
+            blob = salt + iv + ciphertext[-16:] + ciphertext[:-16]
             
             return {
-                'encrypted_key': base64.b64encode(encrypted_data).decode(),
-                'salt': base64.b64encode(salt).decode(),
-                'iv': base64.b64encode(iv).decode(),
-                'auth_tag': base64.b64encode(auth_tag).decode(),
-                'integrity_hash': integrity_hash
+                'blob': base64.b64encode(blob).decode(),
+                'algorithm': ALGORITHM_AES_GCM_AAD,
+                'kdf': KDF_HKDF
             }
             
         except Exception as e:
@@ -100,25 +167,36 @@ class SupabaseService:
     def _decrypt_api_key(self, encrypted_data: Dict[str, str], user_id: str) -> str:
         """Decrypt API key using AES-256-GCM"""
         try:
-            # Decode components
-            salt = base64.b64decode(encrypted_data['salt'])
-            iv = base64.b64decode(encrypted_data['iv'])
-            encrypted_key = base64.b64decode(encrypted_data['encrypted_key'])
-            auth_tag = base64.b64decode(encrypted_data['auth_tag'])
-            
-            # Verify integrity
-            integrity_data = salt + iv + encrypted_key + auth_tag
-            expected_hash = hashlib.sha256(integrity_data).hexdigest()
-            if expected_hash != encrypted_data['integrity_hash']:
-                raise ValueError("Integrity check failed")
-            
-            # Derive key and decrypt
-            key = self._derive_key(user_id, salt)
-            aesgcm = AESGCM(key)
+            # Decode components (packed blob, or the four separate fields on older rows)
+            if encrypted_data.get('blob'):
+                blob = base64.b64decode(encrypted_data['blob'])
+                salt = blob[_BLOB_SALT]
+                iv = blob[_BLOB_IV]
+                auth_tag = blob[_BLOB_TAG]
+                encrypted_key = blob[_BLOB_CIPHERTEXT]
+            else:
+                salt = base64.b64decode(encrypted_data['salt'])
+                iv = base64.b64decode(encrypted_data['iv'])
+                encrypted_key = base64.b64decode(encrypted_data['encrypted_key'])
+                auth_tag = base64.b64decode(encrypted_data['auth_tag'])
+            
+            if encrypted_data.get('algorithm') == ALGORITHM_AES_GCM_AAD:
+                # The GCM tag covers salt and IV; decrypt() fails on any tampering
+                associated_data = salt + iv
+            else:
+                # Older rows: verify the separate integrity hash
+                integrity_data = salt + iv + encrypted_key + auth_tag
+                expected_hash = hashlib.sha256(integrity_data).hexdigest()
+                if expected_hash != encrypted_data['integrity_hash']:
+                    raise ValueError("Integrity check failed")
+                associated_data = None
+            
+            # Derive key (rows written before HKDF carry no kdf or PBKDF2) and decrypt
+            aesgcm = self._get_cipher(user_id, salt, encrypted_data.get('kdf') or KDF_PBKDF2)
             
             # Reconstruct ciphertext with auth tag
             ciphertext = encrypted_key + auth_tag
-            plaintext = aesgcm.decrypt(iv, ciphertext, None)
+            plaintext = aesgcm.decrypt(iv, ciphertext, associated_data)
             
             return plaintext.decode()
             
@@ -126,10 +204,67 @@ class SupabaseService:
             logger.error(f"Error decrypting API key: {str(e)}")
             raise
     
-    def _generate_key_fingerprint(self, user_id: str, service: str) -> str:
+    async def _decrypt_api_key_async(self, encrypted_data: Dict[str, str], user_id: str) -> str:
+        """Decrypt without blocking the event loop on a 100k-iteration PBKDF2 derivation"""
+        if (encrypted_data.get('kdf') or KDF_PBKDF2) == KDF_PBKDF2:
+            cache_key = (user_id, base64.b64decode(encrypted_data['salt']), KDF_PBKDF2)
+            if cache_key not in self._derived_keys:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, self._decrypt_api_key, encrypted_data, user_id)
+        
+        # HKDF rows and cached ciphers are cheap enough to decrypt inline
+        return self._decrypt_api_key(encrypted_data, user_id)
+    
+    def _generate_key_fingerprint(self, user_id: str, service: str, created_at: str) -> str:
         """Generate unique fingerprint for user+service combination"""
-        data = f"{user_id}:{service}:{datetime.utcnow().isoformat()}"
-        return hashlib.sha256(data.encode()).hexdigest()[:32]
+        data = f"{user_id}:{service}:{created_at}"
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+    
+    def _build_key_row(
+        self,
+        user_id: str,
+        service: SupportedService,
+        service_name: str,
+        api_key: str,
+        expires_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Encrypt an API key and build its encrypted_api_keys row"""
+        svc = service.value
+        
+        # Encrypt the API key
+        encrypted_data = self._encrypt_api_key(api_key, user_id)
+        
+        # One timestamp for expiry, fingerprint and created_at
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        
+        # Default expiration: 30 days
+        if not expires_at:
+            expires_at = now + timedelta(days=30)
+        
+        # Generate unique fingerprint
+        fingerprint = self._generate_key_fingerprint(user_id, svc, now_iso)
+        
+        return {
+            'user_id': user_id,
+            'service': svc,
+            'service_name': service_name,
+            'blob': encrypted_data['blob'],
+            # Clear the pre-blob fields when replacing an older row
+            'encrypted_key': None,
+            'salt': None,
+            'iv': None,
+            'auth_tag': None,
+            'integrity_hash': None,
+            'algorithm': encrypted_data['algorithm'],
+            'kdf': encrypted_data['kdf'],
+            'iterations': 1,
+            'key_fingerprint': fingerprint,
+            'status': 'active',
+            'expires_at': expires_at.isoformat(),
+            'created_at': now_iso,
+            'usage_count': 0
+        }
     
     async def store_api_key(
         self, 
@@ -144,34 +279,7 @@ class SupabaseService:
             return False
         
         try:
-            # Encrypt the API key
-            encrypted_data = self._encrypt_api_key(api_key, user_id)
-            
-            # Default expiration: 30 days
-            if not expires_at:
-                expires_at = datetime.utcnow() + timedelta(days=30)
-            
-            # Generate unique fingerprint
-            fingerprint = self._generate_key_fingerprint(user_id, service.value)
-            
-            data = {
-                'user_id': user_id,
-                'service': service.value,
-                'service_name': service_name,
-                'encrypted_key': encrypted_data['encrypted_key'],
-                'salt': encrypted_data['salt'],
-                'iv': encrypted_data['iv'],
-                'auth_tag': encrypted_data['auth_tag'],
-                'integrity_hash': encrypted_data['integrity_hash'],
-                'algorithm': 'AES-256-GCM',
-                'kdf': 'PBKDF2-SHA256',
-                'iterations': 100000,
-                'key_fingerprint': fingerprint,
-                'status': 'active',
-                'expires_at': expires_at.isoformat(),
-                'created_at': datetime.utcnow().isoformat(),
-                'usage_count': 0
-            }
+            data = self._build_key_row(user_id, service, service_name, api_key, expires_at)
             
             # Upsert (insert or update based on user_id + service)
             result = self.client.table('encrypted_api_keys').upsert(
@@ -190,15 +298,52 @@ class SupabaseService:
             logger.error(f"Error storing API key: {str(e)}")
             return False
     
+    async def store_api_keys(
+        self,
+        user_id: str,
+        keys: List[Tuple[SupportedService, str, str]],
+        expires_at: Optional[datetime] = None
+    ) -> bool:
+        """Store several encrypted API keys as (service, service_name, api_key) in one upsert
+        
+        The rows go out in a single statement, so either all of them are written or none are.
+        """
+        if not self.is_available():
+            return False
+        
+        try:
+            rows = [
+                self._build_key_row(user_id, service, service_name, api_key, expires_at)
+                for service, service_name, api_key in keys
+            ]
+            
+            result = self.client.table('encrypted_api_keys').upsert(
+                rows,
+                on_conflict='user_id,service'
+            ).execute()
+            
+            if result.data:
+                logger.info(f"{len(rows)} API keys stored - user_id: {user_id}")
+                return True
+            else:
+                logger.error("Failed to store API keys - no data returned")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Error storing API keys: {str(e)}")
+            return False
+    
     async def get_api_key(self, user_id: str, service: SupportedService) -> Optional[str]:
         """Retrieve and decrypt API key from Supabase"""
         if not self.is_available():
             return None
         
         try:
-            result = self.client.table('encrypted_api_keys').select('*').eq(
+            svc = service.value
+            
+            result = self.client.table('encrypted_api_keys').select(_DECRYPT_COLUMNS).eq(
                 'user_id', user_id
-            ).eq('service', service.value).eq('status', 'active').execute()
+            ).eq('service', svc).eq('status', 'active').execute()
             
             if not result.data:
                 return None
@@ -213,19 +358,17 @@ class SupabaseService:
                     await self._update_key_status(key_data['id'], 'expired')
                     return None
             
-            # Decrypt and return
-            encrypted_data = {
-                'encrypted_key': key_data['encrypted_key'],
-                'salt': key_data['salt'],
-                'iv': key_data['iv'],
-                'auth_tag': key_data['auth_tag'],
-                'integrity_hash': key_data['integrity_hash']
-            }
+            self._key_ids[(user_id, svc)] = (
+                key_data['id'], time.monotonic() + self.key_id_cache_ttl
+            )
             
-            # Update usage count and last used
-            await self._update_key_usage(key_data['id'])
+            # Update usage count and last used without holding up the caller
+            task = asyncio.create_task(self._update_key_usage(key_data['id']))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
             
-            return self._decrypt_api_key(encrypted_data, user_id)
+            # Decrypt and return
+            return await self._decrypt_api_key_async(key_data, user_id)
             
         except Exception as e:
             logger.error(f"Error retrieving API key: {str(e)}")
@@ -237,7 +380,7 @@ class SupabaseService:
             return {}
         
         try:
-            result = self.client.table('encrypted_api_keys').select('*').eq(
+            result = self.client.table('encrypted_api_keys').select(_KEY_METADATA_COLUMNS).eq(
                 'user_id', user_id
             ).eq('status', 'active').execute()
             
@@ -245,16 +388,17 @@ class SupabaseService:
                 return {}
             
             keys = {}
+            expired_ids = []
             current_time = datetime.utcnow()
             
             for key_data in result.data:
                 service = key_data['service']
                 
-                # Check expiration
+                # Check expiration (collected and marked in one update below)
                 if key_data['expires_at']:
                     expires_at = datetime.fromisoformat(key_data['expires_at'].replace('Z', '+00:00'))
                     if current_time > expires_at.replace(tzinfo=None):
-                        await self._update_key_status(key_data['id'], 'expired')
+                        expired_ids.append(key_data['id'])
                         continue
                 
                 keys[service] = {
@@ -267,24 +411,83 @@ class SupabaseService:
                     'status': key_data['status']
                 }
             
+            if expired_ids:
+                self.client.table('encrypted_api_keys').update({
+                    'status': 'expired',
+                    'updated_at': current_time.isoformat()
+                }).in_('id', expired_ids).execute()
+            
             return keys
             
         except Exception as e:
             logger.error(f"Error getting user keys: {str(e)}")
             return {}
     
+    async def get_user_keys_decrypted(self, user_id: str) -> Dict[str, str]:
+        """Get all active API keys for a user, decrypted (service -> API key)"""
+        if not self.is_available():
+            return {}
+        
+        try:
+            result = self.client.table('encrypted_api_keys').select('service,' + _DECRYPT_COLUMNS).eq(
+                'user_id', user_id
+            ).eq('status', 'active').execute()
+            
+            if not result.data:
+                return {}
+            
+            rows = []
+            expired_ids = []
+            current_time = datetime.utcnow()
+            
+            for key_data in result.data:
+                if key_data['expires_at']:
+                    expires_at = datetime.fromisoformat(key_data['expires_at'].replace('Z', '+00:00'))
+                    if current_time > expires_at.replace(tzinfo=None):
+                        expired_ids.append(key_data['id'])
+                        continue
+                rows.append(key_data)
+            
+            if expired_ids:
+                self.client.table('encrypted_api_keys').update({
+                    'status': 'expired',
+                    'updated_at': current_time.isoformat()
+                }).in_('id', expired_ids).execute()
+            
+            # Decrypt rows in parallel; key derivation dominates and runs outside the GIL
+            loop = asyncio.get_running_loop()
+            plaintexts = await asyncio.gather(*(
+                loop.run_in_executor(self._pool, self._decrypt_api_key, key_data, user_id)
+                for key_data in rows
+            ), return_exceptions=True)
+            
+            # Rows that fail to decrypt are logged by _decrypt_api_key and left out
+            return {
+                key_data['service']: plaintext
+                for key_data, plaintext in zip(rows, plaintexts)
+                if not isinstance(plaintext, Exception)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting decrypted user keys: {str(e)}")
+            return {}
+    
     async def delete_api_key(self, user_id: str, service: SupportedService) -> bool:
         """Delete API key from Supabase"""
         if not self.is_available():
             return False
         
         try:
+            svc = service.value
+            
             result = self.client.table('encrypted_api_keys').update({
                 'status': 'revoked',
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('user_id', user_id).eq('service', service.value).execute()
+            }).eq('user_id', user_id).eq('service', svc).execute()
             
-            logger.info(f"API key revoked for {service.value} - user_id: {user_id}")
+            self._forget_derived_keys(user_id)
+            self._forget_key_ids(user_id, svc)
+            logger.info(f"API key revoked for {svc} - user_id: {user_id}")
             return True
             
         except Exception as e:
@@ -302,6 +505,8 @@ class SupabaseService:
                 'updated_at': datetime.utcnow().isoformat()
             }).eq('user_id', user_id).execute()
             
+            self._forget_derived_keys(user_id)
+            self._forget_key_ids(user_id)
             logger.info(f"User session cleared - user_id: {user_id}")
             return True
             
@@ -328,20 +533,26 @@ class SupabaseService:
             return False
         
         try:
-            # Get API key ID
-            key_result = self.client.table('encrypted_api_keys').select('id').eq(
-                'user_id', user_id
-            ).eq('service', service.value).eq('status', 'active').execute()
+            svc = service.value
             
-            if not key_result.data:
-                return False
-            
-            api_key_id = key_result.data[0]['id']
+            # Get API key ID (cached by get_api_key, else looked up)
+            cached = self._key_ids.get((user_id, svc))
+            if cached is not None and cached[1] > time.monotonic():
+                api_key_id = cached[0]
+            else:
+                key_result = self.client.table('encrypted_api_keys').select('id').eq(
+                    'user_id', user_id
+                ).eq('service', svc).eq('status', 'active').execute()
+                
+                if not key_result.data:
+                    return False
+                
+                api_key_id = key_result.data[0]['id']
             
             log_data = {
                 'api_key_id': api_key_id,
                 'user_id': user_id,
-                'service': service.value,
+                'service': svc,
                 'operation': operation,
                 'endpoint': endpoint,
                 'success': success,
@@ -391,23 +602,12 @@ class SupabaseService:
     async def _update_key_usage(self, key_id: str) -> bool:
         """Update API key usage count and last used timestamp"""
         try:
-            # First get current usage count
-            result = self.client.table('encrypted_api_keys').select('usage_count').eq('id', key_id).execute()
-            
-            if not result.data:
-                return False
-            
-            current_count = result.data[0]['usage_count'] or 0
-            
-            # Update usage
-            update_result = self.client.table('encrypted_api_keys').update({
-                'usage_count': current_count + 1,
-                'last_used_at': datetime.utcnow().isoformat(),
-                'last_validation_at': datetime.utcnow().isoformat(),
-                'validation_status': 'valid'
-            }).eq('id', key_id).execute()
-            
-            return bool(update_result.data)
+            # Single atomic increment in Postgres (see sql/increment_key_usage.sql);
+            # run off the event loop since the Supabase client is synchronous
+            await asyncio.to_thread(
+                self.client.rpc('increment_key_usage', {'p_key_id': key_id}).execute
+            )
+            return True
             
         except Exception as e:
             logger.error(f"Error updating key usage: {str(e)}")
@@ -419,14 +619,10 @@ class SupabaseService:
             return 0
         
         try:
-            current_time = datetime.utcnow().isoformat()
-            
-            result = self.client.table('encrypted_api_keys').update({
-                'status': 'expired',
-                'updated_at': current_time
-            }).lt('expires_at', current_time).eq('status', 'active').execute()
+            # One UPDATE in Postgres that returns only the row count (sql/expire_keys.sql)
+            result = self.client.rpc('expire_keys').execute()
             
-            count = len(result.data) if result.data else 0
+            count = result.data or 0
             logger.info(f"Cleaned up {count} expired API keys")
             return count
             
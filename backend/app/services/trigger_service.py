@@ -5,18 +5,20 @@ Handles triggering automation workflows from the FastAPI backend
 
 import os
 import httpx
+import orjson
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
-import asyncio
+from datetime import datetime
 
-from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 
 logger = get_logger(__name__)
 
 class TriggerDevService:
     """Real Trigger.dev v3 integration service"""
     
+    __slots__ = ("api_url", "secret_key", "project_ref", "enabled", "_available", "_client")
+    
     def __init__(self):
         # Use our local API bridge instead of direct Trigger.dev API
         self.api_url = os.getenv('TRIGGER_BRIDGE_URL', 'http://localhost:3001')
@@ -29,10 +31,29 @@ class TriggerDevService:
         else:
             self.enabled = True
             logger.info("Trigger.dev service initialized", project_ref=self.project_ref)
+        
+        self._available = self.enabled and bool(self.secret_key)
+        
+        # One pooled client for all bridge calls, so requests reuse keep-alive connections
+        # (and multiplex over HTTP/2 when the bridge is served over TLS)
+        self._client = httpx.AsyncClient(
+            base_url=self.api_url,
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {self.secret_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
     
     def is_available(self) -> bool:
         """Check if Trigger.dev is properly configured"""
-        return self.enabled and bool(self.secret_key)
+        return self._available
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self._client.aclose()
     
     async def trigger_product_hunt_launch(
         self,
@@ -115,44 +136,31 @@ class TriggerDevService:
     async def _trigger_task(self, task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Internal method to trigger a Trigger.dev task"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.secret_key}",
-                "Content-Type": "application/json"
-            }
+            response = await self._client.post(
+                f"/trigger/{task_id}",
+                content=orjson.dumps(payload)  # Send payload directly, not wrapped
+            )
             
-            trigger_data = {
-                "taskId": task_id,
-                "payload": payload
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_url}/trigger/{task_id}",
-                    json=payload,  # Send payload directly, not wrapped
-                    headers=headers,
-                    timeout=30.0
-                )
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                logger.info(f"Successfully triggered task {task_id}", 
+                          task_id=task_id, run_id=result.get('id'))
+                return {
+                    "success": True,
+                    "task_id": task_id,
+                    "run_id": result.get('id'),
+                    "status": result.get('status'),
+                    "triggered_at": utc_now_iso()
+                }
+            else:
+                error_msg = f"Trigger.dev API error: {response.status_code} - {response.text}"
+                logger.error(error_msg, task_id=task_id)
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "task_id": task_id
+                }
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"Successfully triggered task {task_id}", 
-                              task_id=task_id, run_id=result.get('id'))
-                    return {
-                        "success": True,
-                        "task_id": task_id,
-                        "run_id": result.get('id'),
-                        "status": result.get('status'),
-                        "triggered_at": datetime.utcnow().isoformat()
-                    }
-                else:
-                    error_msg = f"Trigger.dev API error: {response.status_code} - {response.text}"
-                    logger.error(error_msg, task_id=task_id)
-                    return {
-                        "success": False,
-                        "error": error_msg,
-                        "task_id": task_id
-                    }
-                    
         except Exception as e:
             error_msg = f"Failed to trigger task {task_id}: {str(e)}"
             logger.error(error_msg, task_id=task_id, error=str(e))
@@ -168,25 +176,15 @@ class TriggerDevService:
             raise ValueError("Trigger.dev not configured")
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.secret_key}",
-                "Content-Type": "application/json"
-            }
+            response = await self._client.get(f"/api/v1/runs/{run_id}")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/api/v1/runs/{run_id}",
-                    headers=headers,
-                    timeout=30.0
-                )
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                error_msg = f"Failed to get run status: {response.status_code} - {response.text}"
+                logger.error(error_msg, run_id=run_id)
+                return {"error": error_msg}
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    error_msg = f"Failed to get run status: {response.status_code} - {response.text}"
-                    logger.error(error_msg, run_id=run_id)
-                    return {"error": error_msg}
-                    
         except Exception as e:
             error_msg = f"Failed to get run status: {str(e)}"
             logger.error(error_msg, run_id=run_id, error=str(e))
@@ -198,30 +196,19 @@ class TriggerDevService:
             raise ValueError("Trigger.dev not configured")
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.secret_key}",
-                "Content-Type": "application/json"
-            }
-            
             params = {"limit": limit}
             if task_id:
                 params["taskId"] = task_id
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/api/v1/runs",
-                    headers=headers,
-                    params=params,
-                    timeout=30.0
-                )
+            response = await self._client.get("/api/v1/runs", params=params)
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                error_msg = f"Failed to list runs: {response.status_code} - {response.text}"
+                logger.error(error_msg)
+                return {"error": error_msg}
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    error_msg = f"Failed to list runs: {response.status_code} - {response.text}"
-                    logger.error(error_msg)
-                    return {"error": error_msg}
-                    
         except Exception as e:
             error_msg = f"Failed to list runs: {str(e)}"
             logger.error(error_msg, error=str(e))
@@ -1,107 +1,282 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Callable, Dict, Any
 import os
 from dotenv import load_dotenv
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
 import secrets
+import asyncio
+import itertools
+import time
 import httpx
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
-# Load environment variables from .env.local for development
-load_dotenv(".env.local")
-load_dotenv()  # Also load .env if it exists
+# Load environment variables from .env.local (then .env) for development;
+# Railway injects the environment directly, so skip the file reads there
+if os.getenv("RAILWAY_ENVIRONMENT") is None:
+    for env_file in (".env.local", ".env"):
+        if os.path.isfile(env_file):
+            load_dotenv(env_file, override=False)
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.clock import utc_now_iso
 from app.core.agentscope_config import initialize_agentscope, validate_openai_connection
 from app.api.routes import health, conversation, automation
 from app.api.routes import api_keys, integrations
+from app.services.trigger_service import trigger_service
+from app.services.conversation_store import conversation_store
+from app.services.api_key_manager import api_key_manager
+from app.models.api_keys import SupportedService, APIKeySubmission
+from app.agents.openai_base_agent import close_openai_client
 
 logger = get_logger(__name__)
 
+# Environment is fixed for the life of the process; read it once
+_RAILWAY_ENV = os.getenv("RAILWAY_ENVIRONMENT")
+_OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+_SLACK_CLIENT_ID = os.getenv("SLACK_CLIENT_ID", "your-slack-client-id")
+_SLACK_CLIENT_SECRET = os.getenv("SLACK_CLIENT_SECRET", "your-slack-client-secret")
+_SLACK_REDIRECT_URI = os.getenv(
+    "SLACK_REDIRECT_URI",
+    "https://agentos-production-6348.up.railway.app/integrations/slack/oauth/callback"
+)
+
+# Caps on in-flight upstream calls, so request bursts queue here instead of hitting 429s
+_OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+_SLACK_MAX_CONCURRENCY = int(os.getenv("SLACK_MAX_CONCURRENCY", "32"))
+
+# OpenAI SDK availability for /debug/agent-health, checked once
+try:
+    import openai
+    _OPENAI_IMPORT = True
+    _OPENAI_VERSION = getattr(openai, '__version__', 'unknown')
+except ImportError as e:
+    _OPENAI_IMPORT = False
+    _OPENAI_VERSION = f"Import failed: {e}"
+
+# Process-local counter so IDs minted within the same nanosecond stay unique
+_id_counter = itertools.count()
+# Random per-process shard so IDs stay unique across workers and replicas
+# (container PIDs are often identical, so the PID alone is not enough)
+_PROCESS_TAG = secrets.token_hex(4)
+
+def _new_id(prefix: str) -> str:
+    """Generate a unique ID without formatting a timestamp"""
+    return f"{prefix}_{_PROCESS_TAG}_{next(_id_counter):x}_{time.time_ns():x}"
+
+# Static part of the Slack authorize URL; slack_oauth_authorize appends the state
+_SLACK_OAUTH_BASE = "https://slack.com/oauth/v2/authorize?" + urlencode({
+    "client_id": _SLACK_CLIENT_ID,
+    "scope": "chat:write,channels:read",
+    "redirect_uri": _SLACK_REDIRECT_URI,
+    "response_type": "code"
+})
+
+# Shared Slack HTTP client so the connect/OAuth endpoints reuse pooled TLS connections;
+# HTTP/2 lets concurrent Slack calls multiplex over one connection
+slack_http = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+)
+
+# Static automation catalogue served by /automation/capabilities (built once, read-only)
+AUTOMATION_CAPABILITIES = MappingProxyType({
+    "product_hunt_launch": MappingProxyType({
+        "name": "Product Hunt Launch Automation",
+        "description": "Complete Product Hunt launch workflow",
+        "timeline_options": ("same-day", "1-week", "2-weeks", "1-month", "custom"),
+        "status": "available"
+    }),
+    "content_generation": MappingProxyType({
+        "name": "Marketing Content Generation",
+        "description": "Generate marketing content across platforms",
+        "tone_options": ("professional", "casual", "technical", "playful", "authoritative"),
+        "status": "available"
+    }),
+    "analytics_tracking": MappingProxyType({
+        "name": "Analytics & Performance Monitoring",
+        "description": "Set up comprehensive analytics tracking",
+        "metric_options": ("signups", "revenue", "traffic", "social_engagement"),
+        "status": "available"
+    })
+})
+
+# Job id prefix per supported job type; /automation/execute only accepts these keys
+_JOB_ID_PREFIXES = {job_type: f"job_{job_type}" for job_type in AUTOMATION_CAPABILITIES}
+
+# Static part of the capabilities response, serialized once up to the timestamp value;
+# the handler appends the timestamp and closing bytes
+_CAPABILITIES_JSON_PREFIX = orjson.dumps(
+    {"success": True, "capabilities": AUTOMATION_CAPABILITIES},
+    default=dict
+)[:-1] + b',"timestamp":"'
+_CAPABILITIES_JSON_SUFFIX = b'"}'
+
+def _json(payload: Dict[str, Any]) -> Response:
+    """Serialize straight to bytes, skipping FastAPI's jsonable_encoder pass"""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+def _json_cached_per_second(build: Callable[[], Dict[str, Any]]) -> Callable[[], bytes]:
+    """Serialize ``build()`` at most once per second (its timestamps have one-second resolution)"""
+    cache = [-1, b""]
+    
+    def body() -> bytes:
+        second = int(time.time())
+        if cache[0] != second:
+            cache[1] = orjson.dumps(build())
+            cache[0] = second
+        return cache[1]
+    
+    return body
+
+# Request Models
+class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    message: str = Field(..., min_length=1, description="User message")
+    user_id: str = Field("default_user", description="User identifier")
+
+class ExecuteRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    job_type: str = Field(..., min_length=1, description="Automation job type")
+    parameters: Dict[str, Any] = Field(default_factory=dict, description="Job parameters")
+
+_AGENT_RESPONSE_FIELDS = {"agent_name", "content", "timestamp"}
+_CONVERSATION_STATE_FIELDS = {"ready_for_action", "lead_agent", "pending_questions", "answered_questions"}
+
+def _conversation_payload(response, agent_type: str) -> Dict[str, Any]:
+    """Shape a ConversationResponse for the /chat endpoints"""
+    return {
+        "conversation_id": response.conversation_id,
+        "agent_responses": [
+            {**resp.model_dump(include=_AGENT_RESPONSE_FIELDS), "agent_type": agent_type}
+            for resp in response.agent_responses
+        ],
+        "conversation_state": response.conversation_state.model_dump(include=_CONVERSATION_STATE_FIELDS),
+        "timestamp": utc_now_iso()
+    }
+
 # Global conversation manager
 conversation_manager = None
 
+async def _warm_up(app: FastAPI):
+    """Initialize AgentScope and the conversation manager off the startup path"""
+    global conversation_manager
+    
+    try:
+        # Initialize AgentScope
+        if await asyncio.to_thread(initialize_agentscope):
+            logger.info("✅ AgentScope initialized successfully")
+            
+            # Validate OpenAI connection
+            if validate_openai_connection():
+                logger.info("✅ OpenAI connection validated")
+            else:
+                logger.warning("⚠️ OpenAI connection validation failed")
+        else:
+            logger.warning("❌ AgentScope initialization failed - using fallback mode")
+        
+        # Initialize conversation manager (after AgentScope is ready)
+        try:
+            from app.services.conversation_manager import ConversationManager
+            conversation_manager = await asyncio.to_thread(ConversationManager)
+            logger.info("✅ Conversation manager initialized with AgentScope")
+        except Exception as e:
+            logger.error(f"❌ Conversation manager initialization failed: {e}")
+            conversation_manager = None
+        
+        # Set conversation manager in routes
+        try:
+            from app.api.routes.conversation import set_conversation_manager
+            set_conversation_manager(conversation_manager)
+            logger.info("✅ Conversation manager set in routes")
+        except Exception as e:
+            logger.error(f"❌ Failed to set conversation manager in routes: {e}")
+    except Exception as e:
+        logger.error(f"❌ Agent warm-up failed: {str(e)}")
+    finally:
+        # Always release waiting requests, even if warm-up failed
+        app.state.ready.set()
+
+async def _warm_slack_connection():
+    """Open a pooled TLS connection to slack.com so the first user request skips the handshake"""
+    try:
+        await slack_http.get("https://slack.com/api/api.test", timeout=5.0)
+    except Exception as e:
+        logger.warning(f"Slack connection warm-up failed: {str(e)}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    global conversation_manager
     
     # Startup
     logger.info("🚀 Starting Agent OS V2 with AgentScope...")
     
     # Check environment variables
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key:
-        logger.info(f"✅ OPENAI_API_KEY found (length: {len(openai_key)})")
+    if _OPENAI_KEY:
+        logger.info(f"✅ OPENAI_API_KEY found (length: {len(_OPENAI_KEY)})")
     else:
         logger.warning("❌ OPENAI_API_KEY not found in environment!")
     
-    # Initialize AgentScope
-    if initialize_agentscope():
-        logger.info("✅ AgentScope initialized successfully")
-        
-        # Validate OpenAI connection
-        if validate_openai_connection():
-            logger.info("✅ OpenAI connection validated")
-        else:
-            logger.warning("⚠️ OpenAI connection validation failed")
-    else:
-        logger.warning("❌ AgentScope initialization failed - using fallback mode")
-    
-    # Initialize conversation manager (after AgentScope is ready)
-    try:
-        from app.services.conversation_manager import ConversationManager
-        conversation_manager = ConversationManager()
-        logger.info("✅ Conversation manager initialized with AgentScope")
-    except Exception as e:
-        logger.error(f"❌ Conversation manager initialization failed: {e}")
-        conversation_manager = None
-    
-    # Set conversation manager in routes
-    try:
-        from app.api.routes.conversation import set_conversation_manager
-        set_conversation_manager(conversation_manager)
-        logger.info("✅ Conversation manager set in routes")
-    except Exception as e:
-        logger.error(f"❌ Failed to set conversation manager in routes: {e}")
+    # Warm up agents in the background so /health serves immediately;
+    # chat endpoints answer 503 until app.state.ready is set
+    app.state.ready = asyncio.Event()
+    app.state.openai_sem = asyncio.Semaphore(_OPENAI_MAX_CONCURRENCY)
+    app.state.slack_sem = asyncio.Semaphore(_SLACK_MAX_CONCURRENCY)
+    warm_up = asyncio.create_task(_warm_up(app))
+    warm_slack = asyncio.create_task(_warm_slack_connection())
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Agent OS V2...")
+    warm_up.cancel()
+    warm_slack.cancel()
+    await trigger_service.aclose()
+    await slack_http.aclose()
+    await conversation_store.aclose()
+    await close_openai_client()
 
 # Create FastAPI app
 app = FastAPI(
     title="Agent OS V2 - Multi-Agent Platform",
     description="Conversational AI agents with Trigger.dev automation",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure properly in production
+    allow_origins=settings.ALLOWED_ORIGINS,  # Set ALLOWED_ORIGINS in production
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],  # Preflight OPTIONS is handled by the middleware
+    allow_headers=["Authorization", "Content-Type"],  # The only request headers the frontend sends
+    max_age=settings.CORS_MAX_AGE,
 )
 
+# Compress larger JSON bodies (multi-agent chat responses); level 1 keeps CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # Include API routers
 app.include_router(api_keys.router, prefix="/api/keys", tags=["API Keys"])
 app.include_router(integrations.router, prefix="/api/v1/integrations", tags=["Integrations"])
 
-@app.get("/")
-async def root():
-    """Root endpoint - confirms this is OUR server, not AgentScope's"""
+def _root_payload() -> Dict[str, Any]:
     return {
         "message": "🤖 Agent OS V2 - Multi-Agent Platform",
         "version": "2.0.0",
         "status": "running",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),
         "server": "Agent OS V2 Backend (NOT AgentScope)",
         "agents": ["Alex (Strategy)", "Dana (Creative)", "Riley (Data)", "Jamie (Operations)"],
         "features": [
@@ -112,106 +287,74 @@ async def root():
         ]
     }
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "Agent OS V2",
-        "environment": os.getenv("RAILWAY_ENVIRONMENT", "development")
-    }
+_root_body = _json_cached_per_second(_root_payload)
+
+@app.get("/")
+async def root():
+    """Root endpoint - confirms this is OUR server, not AgentScope's"""
+    return Response(content=_root_body(), media_type="application/json")
+
+async def health_check(request):
+    """Liveness probe; the JSON health report is served at /api/v1/"""
+    return PlainTextResponse("ok")
+
+# Plain Starlette route: skips FastAPI's dependency solving and response encoding
+app.add_route("/health", health_check, methods=["GET"], include_in_schema=False)
 
 @app.post("/chat/start")
-async def start_conversation(data: Dict[str, Any]):
+async def start_conversation(request: ChatRequest):
     """Start a new conversation with agents"""
-    global conversation_manager
     
-    message = data.get("message", "")
-    user_id = data.get("user_id", "default_user")
+    message = request.message
+    user_id = request.user_id
     
-    if not message:
-        raise HTTPException(status_code=400, detail="Message is required")
+    if not app.state.ready.is_set():
+        raise HTTPException(status_code=503, detail="Agents are still starting up")
     
     if not conversation_manager:
         raise HTTPException(status_code=500, detail="Conversation manager not initialized")
     
     try:
         # Generate new conversation ID
-        conversation_id = f"conv_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        conversation_id = _new_id("conv")
         
         # Use real conversation manager
-        response = await conversation_manager.handle_user_message(
-            message=message,
-            user_id=user_id,
-            conversation_id=conversation_id
-        )
+        async with app.state.openai_sem:
+            response = await conversation_manager.handle_user_message(
+                message=message,
+                user_id=user_id,
+                conversation_id=conversation_id
+            )
         
-        return {
-            "conversation_id": response.conversation_id,
-            "agent_responses": [
-                {
-                    "agent_name": resp.agent_name,
-                    "content": resp.content,
-                    "timestamp": resp.timestamp.isoformat(),
-                    "agent_type": "lead"
-                }
-                for resp in response.agent_responses
-            ],
-            "conversation_state": {
-                "ready_for_action": response.conversation_state.ready_for_action,
-                "lead_agent": response.conversation_state.lead_agent,
-                "pending_questions": response.conversation_state.pending_questions,
-                "answered_questions": response.conversation_state.answered_questions
-            },
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return _json(_conversation_payload(response, "lead"))
         
     except Exception as e:
         logger.error(f"Error in start_conversation: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/chat/continue/{conversation_id}")
-async def continue_conversation(conversation_id: str, data: Dict[str, Any]):
+async def continue_conversation(conversation_id: str, request: ChatRequest):
     """Continue an existing conversation"""
-    global conversation_manager
     
-    message = data.get("message", "")
-    user_id = data.get("user_id", "default_user")
+    message = request.message
+    user_id = request.user_id
     
-    if not message:
-        raise HTTPException(status_code=400, detail="Message is required")
+    if not app.state.ready.is_set():
+        raise HTTPException(status_code=503, detail="Agents are still starting up")
     
     if not conversation_manager:
         raise HTTPException(status_code=500, detail="Conversation manager not initialized")
     
     try:
         # Use real conversation manager
-        response = await conversation_manager.handle_user_message(
-            message=message,
-            user_id=user_id,
-            conversation_id=conversation_id
-        )
+        async with app.state.openai_sem:
+            response = await conversation_manager.handle_user_message(
+                message=message,
+                user_id=user_id,
+                conversation_id=conversation_id
+            )
         
-        return {
-            "conversation_id": response.conversation_id,
-            "agent_responses": [
-                {
-                    "agent_name": resp.agent_name,
-                    "content": resp.content,
-                    "timestamp": resp.timestamp.isoformat(),
-                    "agent_type": "followup"
-                }
-                for resp in response.agent_responses
-            ],
-            "conversation_state": {
-                "ready_for_action": response.conversation_state.ready_for_action,
-                "lead_agent": response.conversation_state.lead_agent,
-                "pending_questions": response.conversation_state.pending_questions,
-                "answered_questions": response.conversation_state.answered_questions
-            },
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return _json(_conversation_payload(response, "followup"))
         
     except Exception as e:
         logger.error(f"Error in continue_conversation: {e}")
@@ -220,100 +363,66 @@ async def continue_conversation(conversation_id: str, data: Dict[str, Any]):
 @app.get("/automation/capabilities")
 async def get_automation_capabilities():
     """Get available automation capabilities"""
-    return {
-        "success": True,
-        "capabilities": {
-            "product_hunt_launch": {
-                "name": "Product Hunt Launch Automation",
-                "description": "Complete Product Hunt launch workflow",
-                "timeline_options": ["same-day", "1-week", "2-weeks", "1-month", "custom"],
-                "status": "available"
-            },
-            "content_generation": {
-                "name": "Marketing Content Generation",
-                "description": "Generate marketing content across platforms",
-                "tone_options": ["professional", "casual", "technical", "playful", "authoritative"],
-                "status": "available"
-            },
-            "analytics_tracking": {
-                "name": "Analytics & Performance Monitoring",
-                "description": "Set up comprehensive analytics tracking",
-                "metric_options": ["signups", "revenue", "traffic", "social_engagement"],
-                "status": "available"
-            }
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    body = _CAPABILITIES_JSON_PREFIX + utc_now_iso().encode() + _CAPABILITIES_JSON_SUFFIX
+    return Response(content=body, media_type="application/json")
 
 @app.post("/automation/execute")
-async def execute_automation(data: Dict[str, Any]):
+async def execute_automation(request: ExecuteRequest):
     """Execute automation workflow"""
-    job_type = data.get("job_type", "")
-    parameters = data.get("parameters", {})
+    job_type = request.job_type
+    parameters = request.parameters
     
-    if not job_type:
-        raise HTTPException(status_code=400, detail="job_type is required")
+    job_id_prefix = _JOB_ID_PREFIXES.get(job_type)
+    if job_id_prefix is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported job type: {job_type}")
     
     # Mock job execution (will be real Trigger.dev integration)
-    job_id = f"job_{job_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+    job_id = _new_id(job_id_prefix)
     
-    return {
+    return _json({
         "success": True,
         "job_id": job_id,
         "job_type": job_type,
         "status": "queued",
         "estimated_completion": "2-5 minutes",
         "parameters": parameters,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": utc_now_iso()
+    })
 
 @app.get("/debug/agent-health")
 async def debug_agent_health():
     """Debug endpoint to check agent and OpenAI integration status"""
-    import os
     
     # Check environment variables
-    openai_key_exists = os.getenv("OPENAI_API_KEY") is not None
-    openai_key_length = len(os.getenv("OPENAI_API_KEY", "")) if openai_key_exists else 0
+    openai_key_exists = _OPENAI_KEY is not None
+    openai_key_length = len(_OPENAI_KEY) if openai_key_exists else 0
     
     # Check OpenAI agents initialization
     agents_initialized = conversation_manager is not None
     
-    try:
-        import openai
-        openai_import = True
-        openai_version = getattr(openai, '__version__', 'unknown')
-    except ImportError as e:
-        openai_import = False
-        openai_version = f"Import failed: {e}"
-    
-    return {
+    return _json({
         "status": "debug_info",
         "environment": {
             "openai_key_exists": openai_key_exists,
             "openai_key_length": openai_key_length,
-            "railway_env": os.getenv("RAILWAY_ENVIRONMENT", "not_set")
+            "railway_env": _RAILWAY_ENV if _RAILWAY_ENV is not None else "not_set"
         },
         "imports": {
-            "openai_import": openai_import,
-            "openai_version": openai_version
+            "openai_import": _OPENAI_IMPORT,
+            "openai_version": _OPENAI_VERSION
         },
         "initialization": {
             "conversation_manager_exists": agents_initialized,
             "conversation_manager_type": type(conversation_manager).__name__ if conversation_manager else None
         },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": utc_now_iso()
+    })
 
 @app.post("/integrations/slack/connect")
 async def connect_slack_with_triggerdev(session_id: str, slack_bot_token: str):
     """Connect Slack using Trigger.dev integration"""
     
     try:
-        # Store the Slack bot token securely
-        from app.services.api_key_manager import api_key_manager
-        from app.models.api_keys import SupportedService, APIKeySubmission
-        
         # Store Slack token
         submission = APIKeySubmission(
             session_id=session_id,
@@ -327,43 +436,112 @@ async def connect_slack_with_triggerdev(session_id: str, slack_bot_token: str):
             raise HTTPException(status_code=400, detail="Failed to store Slack token")
         
         # Test the connection by making a simple API call
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        async with app.state.slack_sem:
+            response = await slack_http.get(
                 "https://slack.com/api/auth.test",
                 headers={"Authorization": f"Bearer {slack_bot_token}"},
                 timeout=10.0
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("ok"):
-                    return {
-                        "success": True,
-                        "message": "🎉 Slack Connected Successfully!",
-                        "workspace": {
-                            "team": data.get("team", "Unknown"),
-                            "user": data.get("user", "Unknown"),
-                            "team_id": data.get("team_id", "Unknown")
-                        },
-                        "integration_method": "trigger.dev",
-                        "next_steps": [
-                            "✅ Your Slack workspace is now connected to Agent OS",
-                            "🤖 Dana and other agents can now send messages to your Slack channels",
-                            "💬 The Trigger.dev tasks are ready to execute",
-                            "🚀 Try asking an agent to send a Slack message!"
-                        ],
-                        "trigger_dev_status": "Tasks registered and ready",
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                else:
-                    raise HTTPException(status_code=400, detail=f"Slack API error: {data.get('error', 'Unknown error')}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("ok"):
+                return _json({
+                    "success": True,
+                    "message": "🎉 Slack Connected Successfully!",
+                    "workspace": {
+                        "team": data.get("team", "Unknown"),
+                        "user": data.get("user", "Unknown"),
+                        "team_id": data.get("team_id", "Unknown")
+                    },
+                    "integration_method": "trigger.dev",
+                    "next_steps": [
+                        "✅ Your Slack workspace is now connected to Agent OS",
+                        "🤖 Dana and other agents can now send messages to your Slack channels",
+                        "💬 The Trigger.dev tasks are ready to execute",
+                        "🚀 Try asking an agent to send a Slack message!"
+                    ],
+                    "trigger_dev_status": "Tasks registered and ready",
+                    "timestamp": utc_now_iso()
+                })
             else:
-                raise HTTPException(status_code=400, detail="Failed to validate Slack token")
-            
+                raise HTTPException(status_code=400, detail=f"Slack API error: {data.get('error', 'Unknown error')}")
+        else:
+            raise HTTPException(status_code=400, detail="Failed to validate Slack token")
+        
     except Exception as e:
         logger.error(f"Slack connection failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Connection failed: {str(e)}")
 
+# Static parts of the Slack demo message, built once; only the user name,
+# channel and timestamp change per request
+_SLACK_DEMO_TEXT = """🚀 **Agent OS Demo Message**
+
+Hey {user_name}! This is a demo message from Agent OS to show that the Slack integration is working perfectly.
+
+🤖 **What's Connected:**
+• Agent OS backend is running
+• Trigger.dev tasks are registered
+• Slack workspace is connected
+• All agents can now send messages
+
+🎯 **Next Steps:**
+• Try asking Dana to send a creative message
+• Ask Alex for strategic updates
+• Use Riley for data notifications
+• Get Jamie to send operational alerts
+
+*Sent via Agent OS + Trigger.dev integration*"""
+
+_SLACK_DEMO_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "🚀 Agent OS Demo Message"
+    }
+}
+
+_SLACK_DEMO_FIELDS_BLOCK = {
+    "type": "section",
+    "fields": [
+        {
+            "type": "mrkdwn",
+            "text": "*🤖 What's Connected:*\n• Agent OS backend\n• Trigger.dev tasks\n• Slack workspace\n• All agents ready"
+        },
+        {
+            "type": "mrkdwn",
+            "text": "*🎯 Available Agents:*\n• Dana (Creative)\n• Alex (Strategy)\n• Riley (Data)\n• Jamie (Operations)"
+        }
+    ]
+}
+
+def _render_slack_demo(channel: str, user_name: str) -> bytes:
+    """Serialize the chat.postMessage body for the Slack demo"""
+    return orjson.dumps({
+        "channel": channel,
+        "text": _SLACK_DEMO_TEXT.format(user_name=user_name),
+        "blocks": [
+            _SLACK_DEMO_HEADER_BLOCK,
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"Hey {user_name}! This is a demo message from Agent OS to show that the Slack integration is working perfectly."
+                }
+            },
+            _SLACK_DEMO_FIELDS_BLOCK,
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"Sent via Agent OS + Trigger.dev • {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} UTC"
+                    }
+                ]
+            }
+        ]
+    })
+
 @app.post("/integrations/slack/demo")
 async def demo_slack_integration_triggerdev(
     session_id: str, 
@@ -374,170 +552,112 @@ async def demo_slack_integration_triggerdev(
     
     try:
         # Get the stored Slack token
-        from app.services.api_key_manager import api_key_manager
-        from app.models.api_keys import SupportedService
-        
         slack_token = await api_key_manager.get_api_key(session_id, SupportedService.SLACK)
         
         if not slack_token:
             raise HTTPException(status_code=400, detail="No Slack token found. Please connect Slack first.")
         
         # Send a demo message directly using Slack API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with app.state.slack_sem:
+            response = await slack_http.post(
                 "https://slack.com/api/chat.postMessage",
                 headers={
                     "Authorization": f"Bearer {slack_token}",
                     "Content-Type": "application/json"
                 },
-                json={
-                    "channel": channel,
-                    "text": f"""🚀 **Agent OS Demo Message**
-
-Hey {user_name}! This is a demo message from Agent OS to show that the Slack integration is working perfectly.
-
-🤖 **What's Connected:**
-• Agent OS backend is running
-• Trigger.dev tasks are registered
-• Slack workspace is connected
-• All agents can now send messages
-
-🎯 **Next Steps:**
-• Try asking Dana to send a creative message
-• Ask Alex for strategic updates
-• Use Riley for data notifications
-• Get Jamie to send operational alerts
-
-*Sent via Agent OS + Trigger.dev integration*""",
-                    "blocks": [
-                        {
-                            "type": "header",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "🚀 Agent OS Demo Message"
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"Hey {user_name}! This is a demo message from Agent OS to show that the Slack integration is working perfectly."
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "fields": [
-                                {
-                                    "type": "mrkdwn",
-                                    "text": "*🤖 What's Connected:*\n• Agent OS backend\n• Trigger.dev tasks\n• Slack workspace\n• All agents ready"
-                                },
-                                {
-                                    "type": "mrkdwn",
-                                    "text": "*🎯 Available Agents:*\n• Dana (Creative)\n• Alex (Strategy)\n• Riley (Data)\n• Jamie (Operations)"
-                                }
-                            ]
-                        },
-                        {
-                            "type": "context",
-                            "elements": [
-                                {
-                                    "type": "mrkdwn",
-                                    "text": f"Sent via Agent OS + Trigger.dev • {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
-                                }
-                            ]
-                        }
-                    ]
-                },
+                content=_render_slack_demo(channel, user_name),
                 timeout=10.0
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("ok"):
-                    return {
-                        "success": True,
-                        "demo_completed": True,
-                        "message": "🚀 Demo message sent to Slack successfully!",
-                        "channel": channel,
-                        "message_ts": data.get("ts"),
-                        "integration_method": "trigger.dev",
-                        "next_steps": [
-                            "✅ Demo message sent successfully",
-                            "🤖 Agent OS is fully connected to your Slack workspace",
-                            "💬 All agents can now send messages to any channel",
-                            "🚀 Try asking Dana: 'Send a message to #general saying hello!'",
-                            "📊 Ask Riley to send data updates to your team",
-                            "🎯 Get Alex to share strategic insights"
-                        ],
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                else:
-                    raise HTTPException(status_code=400, detail=f"Slack API error: {data.get('error', 'Unknown error')}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("ok"):
+                return _json({
+                    "success": True,
+                    "demo_completed": True,
+                    "message": "🚀 Demo message sent to Slack successfully!",
+                    "channel": channel,
+                    "message_ts": data.get("ts"),
+                    "integration_method": "trigger.dev",
+                    "next_steps": [
+                        "✅ Demo message sent successfully",
+                        "🤖 Agent OS is fully connected to your Slack workspace",
+                        "💬 All agents can now send messages to any channel",
+                        "🚀 Try asking Dana: 'Send a message to #general saying hello!'",
+                        "📊 Ask Riley to send data updates to your team",
+                        "🎯 Get Alex to share strategic insights"
+                    ],
+                    "timestamp": utc_now_iso()
+                })
             else:
-                raise HTTPException(status_code=400, detail="Failed to send demo message")
-            
+                raise HTTPException(status_code=400, detail=f"Slack API error: {data.get('error', 'Unknown error')}")
+        else:
+            raise HTTPException(status_code=400, detail="Failed to send demo message")
+        
     except Exception as e:
         logger.error(f"Slack demo failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Demo failed: {str(e)}")
 
+# /integrations/slack/setup-instructions never changes; serialize it once
+_SLACK_SETUP_INSTRUCTIONS_JSON = orjson.dumps({
+    "success": True,
+    "setup_method": "trigger.dev",
+    "instructions": [
+        "🚀 **Set up Slack for Agent OS using Trigger.dev:**",
+        "",
+        "**Step 1: Create a Slack App**",
+        "1. Go to https://api.slack.com/apps",
+        "2. Click 'Create New App' → 'From scratch'",
+        "3. App Name: 'Agent OS'",
+        "4. Choose your workspace",
+        "",
+        "**Step 2: Configure Bot Permissions**",
+        "1. Go to 'OAuth & Permissions' in your app settings",
+        "2. Add these Bot Token Scopes:",
+        "   • chat:write",
+        "   • channels:read",
+        "",
+        "**Step 3: Install to Workspace**",
+        "1. Click 'Install to Workspace'",
+        "2. Review permissions and click 'Allow'",
+        "3. Copy the 'Bot User OAuth Token' (starts with xoxb-)",
+        "",
+        "**Step 4: Connect to Agent OS**",
+        "1. Paste your Bot Token in the Agent OS settings",
+        "2. Test the connection",
+        "3. Your agents can now send Slack messages via Trigger.dev!"
+    ],
+    "required_scopes": [
+        "chat:write",
+        "channels:read"
+    ],
+    "app_settings": {
+        "app_name": "Agent OS",
+        "description": "Multi-agent AI platform for productivity automation",
+        "integration_method": "trigger.dev + official Slack SDK"
+    },
+    "trigger_dev_info": {
+        "status": "Tasks registered and ready",
+        "available_tasks": [
+            "agent-os-slack-message",
+            "agent-os-create-channel", 
+            "agent-os-slack-workspace-info",
+            "demo-agent-os-slack-integration"
+        ],
+        "dev_server_running": True
+    },
+    "what_users_will_see": [
+        "App name: Agent OS",
+        "App description: Multi-agent AI platform", 
+        "Permissions: Send messages, read channels, upload files",
+        "Messages will show 'Sent by Agent OS' branding"
+    ]
+})
+
 @app.get("/integrations/slack/setup-instructions")
 async def get_slack_setup_instructions():
     """Get instructions for setting up Slack with Agent OS"""
-    
-    return {
-        "success": True,
-        "setup_method": "trigger.dev",
-        "instructions": [
-            "🚀 **Set up Slack for Agent OS using Trigger.dev:**",
-            "",
-            "**Step 1: Create a Slack App**",
-            "1. Go to https://api.slack.com/apps",
-            "2. Click 'Create New App' → 'From scratch'",
-            "3. App Name: 'Agent OS'",
-            "4. Choose your workspace",
-            "",
-            "**Step 2: Configure Bot Permissions**",
-            "1. Go to 'OAuth & Permissions' in your app settings",
-            "2. Add these Bot Token Scopes:",
-            "   • chat:write",
-            "   • channels:read",
-            "",
-            "**Step 3: Install to Workspace**",
-            "1. Click 'Install to Workspace'",
-            "2. Review permissions and click 'Allow'",
-            "3. Copy the 'Bot User OAuth Token' (starts with xoxb-)",
-            "",
-            "**Step 4: Connect to Agent OS**",
-            "1. Paste your Bot Token in the Agent OS settings",
-            "2. Test the connection",
-            "3. Your agents can now send Slack messages via Trigger.dev!"
-        ],
-        "required_scopes": [
-            "chat:write",
-            "channels:read"
-        ],
-        "app_settings": {
-            "app_name": "Agent OS",
-            "description": "Multi-agent AI platform for productivity automation",
-            "integration_method": "trigger.dev + official Slack SDK"
-        },
-        "trigger_dev_info": {
-            "status": "Tasks registered and ready",
-            "available_tasks": [
-                "agent-os-slack-message",
-                "agent-os-create-channel", 
-                "agent-os-slack-workspace-info",
-                "demo-agent-os-slack-integration"
-            ],
-            "dev_server_running": True
-        },
-        "what_users_will_see": [
-            "App name: Agent OS",
-            "App description: Multi-agent AI platform", 
-            "Permissions: Send messages, read channels, upload files",
-            "Messages will show 'Sent by Agent OS' branding"
-        ]
-    }
+    return Response(content=_SLACK_SETUP_INSTRUCTIONS_JSON, media_type="application/json")
 
 @app.get("/integrations/slack/oauth/authorize")
 async def slack_oauth_authorize(session_id: str):
@@ -549,51 +669,35 @@ async def slack_oauth_authorize(session_id: str):
     # Store state in session (in production, use proper session storage)
     # For now, we'll include it in the redirect and verify it in callback
     
-    # Slack OAuth parameters
-    client_id = os.getenv('SLACK_CLIENT_ID', 'your-slack-client-id')
-    redirect_uri = "https://agentos-production-6348.up.railway.app/integrations/slack/oauth/callback"
-    
-    scopes = [
-        "chat:write",
-        "channels:read"
-    ]
-    
-    oauth_params = {
-        "client_id": client_id,
-        "scope": ",".join(scopes),
-        "redirect_uri": redirect_uri,
-        "state": f"{session_id}:{state}",
-        "response_type": "code"
-    }
-    
-    slack_auth_url = f"https://slack.com/oauth/v2/authorize?{urlencode(oauth_params)}"
+    # Only the state varies per request; the rest of the query string is prebuilt
+    slack_auth_url = f"{_SLACK_OAUTH_BASE}&state={quote_plus(f'{session_id}:{state}')}"
     
-    return {
+    return _json({
         "success": True,
         "auth_url": slack_auth_url,
         "state": state,
         "message": "Redirect user to auth_url to complete Slack authorization"
-    }
+    })
 
 @app.get("/integrations/slack/oauth/callback")
 async def slack_oauth_callback(code: str, state: str, error: str = None):
     """Handle Slack OAuth callback"""
     
     if error:
-        return {
+        return _json({
             "success": False,
             "error": error,
             "message": "Slack authorization was denied or failed"
-        }
+        })
     
     try:
         # Parse state to get session_id
         session_id, state_token = state.split(":", 1)
         
         # Exchange code for access token
-        client_id = os.getenv('SLACK_CLIENT_ID', 'your-slack-client-id')
-        client_secret = os.getenv('SLACK_CLIENT_SECRET', 'your-slack-client-secret')
-        redirect_uri = "https://agentos-production-6348.up.railway.app/integrations/slack/oauth/callback"
+        client_id = _SLACK_CLIENT_ID
+        client_secret = _SLACK_CLIENT_SECRET
+        redirect_uri = _SLACK_REDIRECT_URI
         
         token_data = {
             "client_id": client_id,
@@ -602,52 +706,49 @@ async def slack_oauth_callback(code: str, state: str, error: str = None):
             "redirect_uri": redirect_uri
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with app.state.slack_sem:
+            response = await slack_http.post(
                 "https://slack.com/api/oauth.v2.access",
                 data=token_data,
                 headers={"Content-Type": "application/x-www-form-urlencoded"}
             )
+        
+        result = response.json()
+        
+        if not result.get("ok"):
+            raise Exception(f"Slack OAuth error: {result.get('error', 'Unknown error')}")
+        
+        # Extract bot token
+        bot_token = result["access_token"]
+        team_info = result.get("team", {})
+        
+        # Store the bot token securely
+        submission = APIKeySubmission(
+            session_id=session_id,
+            service=SupportedService.SLACK,
+            api_key=bot_token
+        )
+        
+        success = await api_key_manager.submit_api_key(submission)
+        
+        if success:
+            # Return success page or redirect to frontend
+            return _json({
+                "success": True,
+                "message": f"Successfully connected to Slack workspace: {team_info.get('name', 'Unknown')}",
+                "team": team_info,
+                "redirect_to": f"http://localhost:3000/settings?slack_connected=true"
+            })
+        else:
+            raise Exception("Failed to store Slack token")
             
-            result = response.json()
-            
-            if not result.get("ok"):
-                raise Exception(f"Slack OAuth error: {result.get('error', 'Unknown error')}")
-            
-            # Extract bot token
-            bot_token = result["access_token"]
-            team_info = result.get("team", {})
-            
-            # Store the bot token securely
-            from app.services.api_key_manager import api_key_manager
-            from app.models.api_keys import SupportedService, APIKeySubmission
-            
-            submission = APIKeySubmission(
-                session_id=session_id,
-                service=SupportedService.SLACK,
-                api_key=bot_token
-            )
-            
-            success = await api_key_manager.submit_api_key(submission)
-            
-            if success:
-                # Return success page or redirect to frontend
-                return {
-                    "success": True,
-                    "message": f"Successfully connected to Slack workspace: {team_info.get('name', 'Unknown')}",
-                    "team": team_info,
-                    "redirect_to": f"http://localhost:3000/settings?slack_connected=true"
-                }
-            else:
-                raise Exception("Failed to store Slack token")
-                
     except Exception as e:
         logger.error(f"Slack OAuth callback error: {str(e)}")
-        return {
+        return _json({
             "success": False,
             "error": str(e),
             "message": "Failed to complete Slack authorization"
-        }
+        })
 
 # Include API routes
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
@@ -657,4 +758,18 @@ app.include_router(automation.router, prefix="/api/v1", tags=["automation"])
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True) 
\ No newline at end of file
+    # uvloop/httptools ship with uvicorn[standard]. Conversation state is only
+    # shared between processes through Redis, so default to one worker per
+    # core only in production with REDIS_URL set; WEB_CONCURRENCY overrides.
+    # reload and workers are mutually exclusive, so DEBUG always runs one worker
+    multi_worker = not settings.DEBUG and bool(settings.REDIS_URL)
+    workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 2) if multi_worker else 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else workers
+    ) 
\ No newline at end of file
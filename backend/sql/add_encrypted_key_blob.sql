@@ -0,0 +1,8 @@
+-- Store salt, IV, auth tag and ciphertext as one packed base64 column.
+-- Rows written before this keep the separate columns, which become optional.
+alter table encrypted_api_keys add column if not exists blob text;
+alter table encrypted_api_keys alter column encrypted_key drop not null;
+alter table encrypted_api_keys alter column salt drop not null;
+alter table encrypted_api_keys alter column iv drop not null;
+alter table encrypted_api_keys alter column auth_tag drop not null;
+alter table encrypted_api_keys alter column integrity_hash drop not null;
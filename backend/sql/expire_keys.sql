@@ -0,0 +1,18 @@
+-- Mark every active key past its expiry as expired and return how many changed.
+-- Called from SupabaseService.cleanup_expired_keys via rpc('expire_keys').
+create or replace function expire_keys()
+returns integer
+language plpgsql
+as $$
+declare
+    expired_count integer;
+begin
+    update encrypted_api_keys
+    set status = 'expired',
+        updated_at = now()
+    where status = 'active'
+      and expires_at < now();
+    get diagnostics expired_count = row_count;
+    return expired_count;
+end;
+$$;
@@ -0,0 +1,13 @@
+-- Atomically record one use of an API key.
+-- Called from SupabaseService._update_key_usage via rpc('increment_key_usage').
+create or replace function increment_key_usage(p_key_id uuid)
+returns void
+language sql
+as $$
+    update encrypted_api_keys
+    set usage_count = coalesce(usage_count, 0) + 1,
+        last_used_at = now(),
+        last_validation_at = now(),
+        validation_status = 'valid'
+    where id = p_key_id;
+$$;
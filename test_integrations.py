@@ -4,17 +4,19 @@ Test script for AgentOS service integrations
 Run this to test your Slack and Notion connections
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import sys
 
 # Backend URL
 BASE_URL = "http://localhost:8000"
+SESSION_ID = "integration_test"
 
-def test_health():
+async def test_health(client):
     """Test if backend is running"""
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = await client.get("/")
         if response.status_code == 200:
             result = response.json()
             if result.get("status") == "running":
@@ -26,20 +28,20 @@ def test_health():
         else:
             print("❌ Backend health check failed")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Cannot connect to backend. Make sure it's running on port 8000")
         return False
 
-def store_api_key(service, api_key, service_name):
+async def store_api_key(client, service, api_key, service_name):
     """Store an API key"""
     data = {
         "service": service,
-        "service_name": service_name,
-        "api_key": api_key
+        "api_key": api_key,
+        "session_id": SESSION_ID
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/keys/store", json=data)
+        response = await client.post("/api/keys/submit", json=data)
         if response.status_code == 200:
             print(f"✅ {service_name} API key stored successfully")
             return True
@@ -50,17 +52,17 @@ def store_api_key(service, api_key, service_name):
         print(f"❌ Error storing API key: {e}")
         return False
 
-def test_service_connection(service):
+async def test_service_connection(client, service):
     """Test service connection"""
     try:
-        response = requests.get(f"{BASE_URL}/api/v1/integrations/{service}/test")
+        response = await client.post("/api/v1/integrations/test-connections", params={"session_id": SESSION_ID})
         if response.status_code == 200:
-            result = response.json()
-            if result.get("success"):
+            result = response.json().get("results", {}).get(service, {})
+            if result.get("connected"):
                 print(f"✅ {service.title()} connection test passed")
                 return True
             else:
-                print(f"❌ {service.title()} connection test failed: {result.get('error')}")
+                print(f"❌ {service.title()} connection test failed: {result.get('message')}")
                 return False
         else:
             print(f"❌ {service.title()} test request failed: {response.text}")
@@ -69,7 +71,7 @@ def test_service_connection(service):
         print(f"❌ Error testing {service}: {e}")
         return False
 
-def test_slack_message():
+async def test_slack_message(client):
     """Test sending a Slack message"""
     data = {
         "channel": "#general",  # Change this to your channel
@@ -78,7 +80,7 @@ def test_slack_message():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/v1/integrations/slack/send-message", json=data)
+        response = await client.post("/api/v1/integrations/slack/send-message", json=data, params={"session_id": SESSION_ID})
         if response.status_code == 200:
             result = response.json()
             if result.get("success"):
@@ -94,7 +96,7 @@ def test_slack_message():
         print(f"❌ Error sending Slack message: {e}")
         return False
 
-def test_notion_page():
+async def test_notion_page(client):
     """Test creating a Notion page"""
     data = {
         "title": "🤖 Test Page from AgentOS",
@@ -103,7 +105,7 @@ def test_notion_page():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/api/v1/integrations/notion/create-page", json=data)
+        response = await client.post("/api/v1/integrations/notion/create-page", json=data, params={"session_id": SESSION_ID})
         if response.status_code == 200:
             result = response.json()
             if result.get("success"):
@@ -120,48 +122,55 @@ def test_notion_page():
         print(f"❌ Error creating Notion page: {e}")
         return False
 
-def main():
+async def main():
     print("🚀 AgentOS Integration Test Suite")
     print("=" * 40)
     
-    # Test backend health
-    if not test_health():
-        sys.exit(1)
-    
-    print("\n📝 API Key Setup")
-    print("-" * 20)
-    
-    # Get API keys from user
-    slack_token = input("Enter your Slack Bot Token (xoxb-...): ").strip()
-    if slack_token:
-        store_api_key("slack", slack_token, "Slack Bot")
-    
-    notion_token = input("Enter your Notion Integration Token (secret_...): ").strip()
-    if notion_token:
-        store_api_key("notion", notion_token, "Notion Integration")
-    
-    print("\n🔍 Connection Tests")
-    print("-" * 20)
-    
-    # Test connections
-    if slack_token:
-        test_service_connection("slack")
-    
-    if notion_token:
-        test_service_connection("notion")
-    
-    print("\n🧪 Functionality Tests")
-    print("-" * 20)
-    
-    # Test actual functionality
-    if slack_token:
-        test_slack_message()
-    
-    if notion_token:
-        test_notion_page()
+    # One client for the whole run so every call reuses the same connection pool;
+    # the Slack and Notion checks in each phase are independent and run concurrently
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        # Test backend health
+        if not await test_health(client):
+            sys.exit(1)
+        
+        print("\n📝 API Key Setup")
+        print("-" * 20)
+        
+        # Get API keys from user
+        slack_token = input("Enter your Slack Bot Token (xoxb-...): ").strip()
+        notion_token = input("Enter your Notion Integration Token (secret_...): ").strip()
+        
+        store_tasks = []
+        if slack_token:
+            store_tasks.append(store_api_key(client, "slack", slack_token, "Slack Bot"))
+        if notion_token:
+            store_tasks.append(store_api_key(client, "notion", notion_token, "Notion Integration"))
+        await asyncio.gather(*store_tasks)
+        
+        print("\n🔍 Connection Tests")
+        print("-" * 20)
+        
+        # Test connections
+        connection_tasks = []
+        if slack_token:
+            connection_tasks.append(test_service_connection(client, "slack"))
+        if notion_token:
+            connection_tasks.append(test_service_connection(client, "notion"))
+        await asyncio.gather(*connection_tasks)
+        
+        print("\n🧪 Functionality Tests")
+        print("-" * 20)
+        
+        # Test actual functionality
+        functionality_tasks = []
+        if slack_token:
+            functionality_tasks.append(test_slack_message(client))
+        if notion_token:
+            functionality_tasks.append(test_notion_page(client))
+        await asyncio.gather(*functionality_tasks)
     
     print("\n✨ Test complete!")
     print("Check your Slack channel and Notion workspace for test messages/pages.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
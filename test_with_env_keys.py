@@ -4,7 +4,8 @@ Test AgentOS with existing .env API keys
 This script automatically uses your configured API keys
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import os
 from dotenv import load_dotenv
@@ -14,11 +15,12 @@ load_dotenv()
 
 # Backend URL
 BASE_URL = "http://localhost:8000"
+SESSION_ID = "env_keys_test"
 
-def test_backend():
+async def test_backend(client):
     """Test if backend is running"""
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = await client.get("/")
         if response.status_code == 200:
             result = response.json()
             print("✅ Backend is running")
@@ -28,63 +30,71 @@ def test_backend():
         else:
             print("❌ Backend not responding")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Cannot connect to backend. Make sure it's running on port 8000")
         return False
 
-def auto_store_api_keys():
-    """Automatically store API keys from environment"""
+async def auto_store_api_keys(client):
+    """Automatically store API keys from environment in one batch request"""
     keys_to_store = [
         ("slack", "Slack Integration", os.getenv("SLACK_CLIENT_SECRET")),
         ("notion", "Notion Integration", os.getenv("NOTION_CLIENT_SECRET")),
-        ("monday", "Monday.com Integration", os.getenv("MONDAY_CLIENT_SECRET")),
     ]
     
-    stored_count = 0
+    keys = []
+    names = {}
     for service, name, api_key in keys_to_store:
         if api_key:
-            try:
-                data = {
-                    "service": service,
-                    "service_name": name,
-                    "api_key": api_key
-                }
-                response = requests.post(f"{BASE_URL}/api/keys/store", json=data)
-                if response.status_code == 200:
-                    print(f"✅ {name} API key stored")
-                    stored_count += 1
-                else:
-                    print(f"❌ Failed to store {name} key: {response.text}")
-            except Exception as e:
-                print(f"❌ Error storing {name} key: {e}")
+            keys.append({"service": service, "api_key": api_key})
+            names[service] = name
         else:
             print(f"⚠️  {name} key not found in environment")
     
-    return stored_count
+    if not keys:
+        return 0
+    
+    try:
+        response = await client.post("/api/keys/submit-batch", json={"session_id": SESSION_ID, "keys": keys})
+        if response.status_code == 200:
+            result = response.json()
+            for service, success in result.get("stored", {}).items():
+                if success:
+                    print(f"✅ {names[service]} API key stored")
+                else:
+                    print(f"❌ Failed to store {names[service]} key")
+            return result.get("stored_count", 0)
+        else:
+            print(f"❌ Failed to store API keys: {response.text}")
+    except Exception as e:
+        print(f"❌ Error storing API keys: {e}")
+    return 0
 
-def test_integrations():
+async def test_integration(client, service):
+    """Test one service integration"""
+    try:
+        response = await client.get(f"/api/v1/integrations/{service}/test")
+        if response.status_code == 200:
+            result = response.json()
+            if result.get("success"):
+                print(f"✅ {service.title()} integration working")
+            else:
+                print(f"❌ {service.title()} integration failed: {result.get('error')}")
+        else:
+            print(f"❌ {service.title()} test failed: {response.text}")
+    except Exception as e:
+        print(f"❌ Error testing {service}: {e}")
+
+async def test_integrations(client):
     """Test service integrations"""
     services = ["slack", "notion"]
     
-    for service in services:
-        try:
-            response = requests.get(f"{BASE_URL}/api/v1/integrations/{service}/test")
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    print(f"✅ {service.title()} integration working")
-                else:
-                    print(f"❌ {service.title()} integration failed: {result.get('error')}")
-            else:
-                print(f"❌ {service.title()} test failed: {response.text}")
-        except Exception as e:
-            print(f"❌ Error testing {service}: {e}")
+    await asyncio.gather(*(test_integration(client, service) for service in services))
 
-def test_automation():
+async def test_automation(client):
     """Test Trigger.dev automation"""
     try:
         # Test automation health
-        response = requests.get(f"{BASE_URL}/api/automation/health")
+        response = await client.get("/api/automation/health")
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Automation service available: {result.get('trigger_dev_available')}")
@@ -99,7 +109,7 @@ def test_automation():
                 }
             }
             
-            response = requests.post(f"{BASE_URL}/api/automation/analytics-tracking", json=automation_data)
+            response = await client.post("/api/automation/analytics-tracking", json=automation_data)
             if response.status_code == 200:
                 result = response.json()
                 print(f"✅ Automation triggered successfully: {result.get('run_id')}")
@@ -110,28 +120,30 @@ def test_automation():
     except Exception as e:
         print(f"❌ Error testing automation: {e}")
 
-def main():
+async def main():
     print("🚀 AgentOS Test Suite (Using .env Keys)")
     print("=" * 45)
     
-    # Test backend
-    if not test_backend():
-        print("\n❌ Backend not running. Start it with:")
-        print("   cd backend && python3 -m uvicorn app.main:app --reload")
-        return
-    
-    print("\n🔐 Auto-storing API Keys")
-    print("-" * 25)
-    stored = auto_store_api_keys()
-    print(f"Stored {stored} API keys")
-    
-    print("\n🔍 Testing Integrations")
-    print("-" * 25)
-    test_integrations()
-    
-    print("\n🤖 Testing Automation")
-    print("-" * 25)
-    test_automation()
+    # One client for the whole run so every call reuses the same connection pool
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        # Test backend
+        if not await test_backend(client):
+            print("\n❌ Backend not running. Start it with:")
+            print("   cd backend && python3 -m uvicorn app.main:app --reload")
+            return
+        
+        print("\n🔐 Auto-storing API Keys")
+        print("-" * 25)
+        stored = await auto_store_api_keys(client)
+        print(f"Stored {stored} API keys")
+        
+        print("\n🔍 Testing Integrations")
+        print("-" * 25)
+        await test_integrations(client)
+        
+        print("\n🤖 Testing Automation")
+        print("-" * 25)
+        await test_automation(client)
     
     print("\n✨ Test Complete!")
     print("\n🎯 What you can do now:")
@@ -142,4 +154,4 @@ def main():
     print("  • View API docs: http://localhost:8000/docs")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file